@@ -0,0 +1,47 @@
+"""
+Combo Page Markers
+
+Strings the combo test page must contain. Shared by the manual runner
+test_working_custom_combo.py and tests/test_combo_page.py.
+"""
+
+PAGE_MARKERS = [
+    "Custom Combo Box Test",
+    "Generate Test Combo Boxes",
+    "Mode: DISPLAY",
+    "<!DOCTYPE html>",
+]
+
+FUNCTION_MARKERS = [
+    "handleEnterKey",
+    "addOrUpdateItem",
+    "deleteSelectedItem",
+    "showDropdown",
+    "hideDropdown",
+    "selectItem",
+    "toggleMode",
+    "generateTestComboBoxes",
+]
+
+EVENT_LISTENER_MARKERS = [
+    "addEventListener('keydown'",
+    "addEventListener('focus'",
+    "addEventListener('blur'",
+    "addEventListener('input'",
+    "addEventListener('click'",
+]
+
+MODE_MARKERS = [
+    "getModeOptions",
+    "getModePlaceholder",
+    "Add item",
+    "Select item",
+    "Enter ${tag}",
+    "Select ${tag}",
+]
+
+UI_MARKERS = [
+    "btn btn-",
+    "form-control",
+    "dropdown-menu",
+]
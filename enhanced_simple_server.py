@@ -1664,13 +1664,7 @@ def import_prompts():
 def get_templates():
     """Get available templates as JSON."""
     try:
-        templates = []
-        for template in template_builder.templates:
-            templates.append({
-                "name": template.name,
-                "pattern": template.pattern,
-                "slots": template.slots
-            })
+        templates = [template.asdict() for template in template_builder.templates]
         return json.dumps(templates), 200, {'Content-Type': 'application/json'}
     except Exception as e:
         return json.dumps({"error": str(e)}), 500, {'Content-Type': 'application/json'}
@@ -27,9 +27,12 @@ class UUIDEncoder(json.JSONEncoder):
 class PromptManagerAPI:
     """REST API for prompt manager operations."""
     
-    def __init__(self, storage_file: str = "prompts.json"):
-        # Single PromptManager instance
-        self.manager = PromptManager(storage_file)
+    def __init__(self, storage_file: str = "prompts.json", templates_storage: str = "templates.json",
+                 storage=None):
+        # Single PromptManager instance; storage, if given, replaces the storage file
+        self.manager = PromptManager(storage_file, storage=storage)
+        # Saved templates are kept in their own file
+        self.templates_storage = templates_storage
         
         # Initialize business logic components
         self.validator = PromptValidator()
@@ -429,7 +432,7 @@ class PromptManagerAPI:
                 
                 # Initialize template service
                 from .template_service import TemplateService
-                template_service = TemplateService('templates.json')
+                template_service = TemplateService(self.templates_storage)
                 
                 # Save template
                 template_service.save_template(
@@ -461,7 +464,7 @@ class PromptManagerAPI:
             """Load a template by name using new TemplateService."""
             try:
                 from .template_service import TemplateService
-                template_service = TemplateService('templates.json')
+                template_service = TemplateService(self.templates_storage)
                 template = template_service.load_template(template_name)
                 
                 return jsonify({
@@ -485,7 +488,7 @@ class PromptManagerAPI:
             """List all saved templates using new TemplateService."""
             try:
                 from .template_service import TemplateService
-                template_service = TemplateService('templates.json')
+                template_service = TemplateService(self.templates_storage)
                 templates = template_service.list_templates()
                 
                 return jsonify({
@@ -504,7 +507,7 @@ class PromptManagerAPI:
             """Delete a template by name using new TemplateService."""
             try:
                 from .template_service import TemplateService
-                template_service = TemplateService('templates.json')
+                template_service = TemplateService(self.templates_storage)
                 
                 if not template_service.template_exists(template_name):
                     return jsonify({
@@ -530,7 +533,7 @@ class PromptManagerAPI:
             """Check if a template exists using new TemplateService."""
             try:
                 from .template_service import TemplateService
-                template_service = TemplateService('templates.json')
+                template_service = TemplateService(self.templates_storage)
                 exists = template_service.template_exists(template_name)
                 
                 return jsonify({
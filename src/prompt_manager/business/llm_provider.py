@@ -1,6 +1,5 @@
 from abc import ABC, abstractmethod
 from typing import Optional
-import openai
 
 class LLMProvider(ABC):
     @abstractmethod
@@ -39,6 +38,8 @@ class OpenAIProvider(LLMProvider):
             except ValueError:
                 raise ValueError("OpenAI API key is required")
         
+        # Imported here so loading the provider module doesn't pull in the openai SDK
+        import openai
         try:
             self.client = openai.OpenAI(api_key=self.api_key)
             self._initialized = True
@@ -0,0 +1,29 @@
+"""
+JSON Codec
+
+Encodes and decodes prompt JSON with orjson when it is installed and the
+standard library json module otherwise. Both paths produce the same text.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def dumps_json(obj, indent: bool = False) -> str:
+    """Serialize to JSON: raw UTF-8, compact separators, or a 2-space indent."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def loads_json(data):
+    """Parse JSON from a str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
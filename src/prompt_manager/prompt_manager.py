@@ -5,8 +5,9 @@ from .storage import StorageManager
 
 
 class PromptManager:
-    def __init__(self, storage_file: str = "prompts.json"):
-        self.storage = StorageManager(storage_file)
+    def __init__(self, storage_file: str = "prompts.json", storage=None):
+        # Any object with StorageManager's load_prompts/save_prompts will do
+        self.storage = storage if storage is not None else StorageManager(storage_file)
         self.prompts: Dict[str, Prompt] = {}
         self.load_prompts()
     
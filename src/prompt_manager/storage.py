@@ -1,6 +1,6 @@
-import json
 import os
 from typing import Dict, List
+from .json_codec import dumps_json, loads_json
 from .prompt import Prompt
 
 
@@ -19,7 +19,7 @@ class StorageManager:
             }
             
             with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(dumps_json(data, indent=True))
             
             return True
         except Exception as e:
@@ -33,7 +33,7 @@ class StorageManager:
         
         try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = loads_json(f.read())
             
             prompts = {}
             for prompt_id, prompt_data in data.get('prompts', {}).items():
@@ -57,4 +57,32 @@ class StorageManager:
             return True
         except Exception as e:
             print(f"Error deleting file: {e}")
-            return False 
\ No newline at end of file
+            return False 
+
+
+class InMemoryStorage:
+    """Dict-backed stand-in for StorageManager that never touches the disk."""
+    
+    def __init__(self):
+        self._data: Dict[str, dict] = {}
+        self._saved = False
+    
+    def save_prompts(self, prompts: Dict[str, Prompt]) -> bool:
+        """Keep a serialized copy of the prompts. Always returns True."""
+        self._data = {prompt_id: prompt.to_dict() for prompt_id, prompt in prompts.items()}
+        self._saved = True
+        return True
+    
+    def load_prompts(self) -> Dict[str, Prompt]:
+        """Rebuild the last saved prompts. Returns empty dict if nothing was saved."""
+        return {prompt_id: Prompt.from_dict(prompt_data) for prompt_id, prompt_data in self._data.items()}
+    
+    def file_exists(self) -> bool:
+        """Check if prompts have been saved."""
+        return self._saved
+    
+    def delete_file(self) -> bool:
+        """Forget the saved prompts. Always returns True."""
+        self._data = {}
+        self._saved = False
+        return True
@@ -21,7 +21,7 @@ PREDEFINED_CATEGORIES = [
 @prompt_bp.route('/')
 def index():
     """Main page showing all prompts."""
-    prompts = prompt_service.get_all_prompts()
+    prompts = prompt_service.get_all_prompts(readonly=True)
     categories = prompt_service.get_categories()
     
     # HTML template for the main page
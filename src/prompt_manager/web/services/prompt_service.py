@@ -5,31 +5,79 @@ Handles prompt CRUD operations, search, and validation.
 """
 
 import json
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+import uuid
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from src.prompt_manager.json_codec import dumps_json
+from src.prompt_manager.prompt import Prompt
 from src.prompt_manager.prompt_manager import PromptManager
 
+# Queries this short are typed-ahead prefixes and worth caching.
+PREFIX_CACHE_MAX_QUERY_LENGTH = 3
+PREFIX_CACHE_SIZE = 256
+
 
 class PromptService:
     """Service for prompt operations."""
     
-    def __init__(self):
-        self.prompt_manager = PromptManager()
+    def __init__(self, prompt_manager: Optional[PromptManager] = None):
+        self.prompt_manager = prompt_manager if prompt_manager is not None else PromptManager()
+        # Prompt dicts built from the manager, plus an id -> prompt index over the same dicts;
+        # callers only ever get copies or read-only views of them
+        self._prompts: Optional[List[Dict]] = None
+        self._prompts_tuple: Optional[Tuple[Mapping, ...]] = None
+        self._by_id: Dict[str, Dict] = {}
+        # Bumped on every change to the prompts; stale search caches are dropped lazily
+        self._version = 0
+        self._prefix_cache: "OrderedDict[str, Tuple[Dict, ...]]" = OrderedDict()
+        self._prefix_cache_version = 0
     
-    def get_all_prompts(self) -> List[Dict]:
-        """Get all prompts."""
-        return self.prompt_manager.get_all_prompts()
+    def get_all_prompts(self, readonly: bool = False) -> Sequence[Mapping]:
+        """Get all prompts.
+        
+        Returns new prompt dicts the caller may modify, or with readonly=True a
+        shared tuple of read-only prompts that is only rebuilt after the prompts change.
+        """
+        prompts = self._load_prompts()
+        if not readonly:
+            return [dict(prompt) for prompt in prompts]
+        if self._prompts_tuple is None:
+            self._prompts_tuple = tuple(MappingProxyType(prompt) for prompt in prompts)
+        return self._prompts_tuple
     
     def search_prompts(self, query: str) -> List[Dict]:
         """Search prompts by query."""
         if not query:
             return self.get_all_prompts()
         
-        all_prompts = self.get_all_prompts()
         query_lower = query.lower()
+        if len(query_lower) <= PREFIX_CACHE_MAX_QUERY_LENGTH:
+            results = self._cached_search(query_lower)
+        else:
+            results = self._search(query_lower)
+        return [dict(prompt) for prompt in results]
+    
+    def _cached_search(self, query_lower: str) -> Tuple[Dict, ...]:
+        """Answer a short query from the LRU prefix cache."""
+        if self._prefix_cache_version != self._version:
+            self._prefix_cache.clear()
+            self._prefix_cache_version = self._version
+        
+        results = self._prefix_cache.get(query_lower)
+        if results is not None:
+            self._prefix_cache.move_to_end(query_lower)
+            return results
         
+        results = tuple(self._search(query_lower))
+        self._prefix_cache[query_lower] = results
+        if len(self._prefix_cache) > PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return results
+    
+    def _search(self, query_lower: str) -> List[Dict]:
         filtered_prompts = []
-        for prompt in all_prompts:
+        for prompt in self._load_prompts():
             if (query_lower in prompt.get('name', '').lower() or 
                 query_lower in prompt.get('text', '').lower() or
                 query_lower in prompt.get('category', '').lower()):
@@ -53,71 +101,122 @@ class PromptService:
             return True, "Prompt created successfully"
         except Exception as e:
             return False, f"Error creating prompt: {str(e)}"
+        finally:
+            self._invalidate()
     
     def update_prompt(self, prompt_id: str, name: str, text: str, category: str) -> Tuple[bool, str]:
         """Update an existing prompt."""
         if not prompt_id or not name or not text:
             return False, "Prompt ID, name, and text are required"
         
-        if len(name) > 100:
-            return False, "Name must be 100 characters or less"
-        
-        if len(text) > 5000:
-            return False, "Text must be 5000 characters or less"
+        error = self._validate_lengths(name, text)
+        if error:
+            return False, error
         
         try:
-            # Get existing prompt to preserve other fields
-            all_prompts = self.get_all_prompts()
-            existing_prompt = None
-            for prompt in all_prompts:
-                if prompt.get('id') == prompt_id:
-                    existing_prompt = prompt
-                    break
-            
-            if not existing_prompt:
+            prompt = self.prompt_manager.get_prompt(prompt_id)
+            if not prompt:
                 return False, "Prompt not found"
             
-            # Update fields
-            existing_prompt['name'] = name
-            existing_prompt['text'] = text
-            existing_prompt['category'] = category
-            existing_prompt['modified_at'] = datetime.now().isoformat()
-            
-            # Save updated prompts
-            self.prompt_manager.save_prompts(all_prompts)
+            self._apply_update(prompt, name, text, category)
+            self._save()
             return True, "Prompt updated successfully"
         except Exception as e:
             return False, f"Error updating prompt: {str(e)}"
     
+    def update_prompts_bulk(self, updates: List[Dict]) -> Tuple[bool, str]:
+        """Apply several updates and save the prompts once.
+        
+        Each update is a dict with 'id', 'name', 'text' and optional 'category'.
+        Nothing is changed if any update is invalid or refers to a missing prompt.
+        """
+        for update in updates:
+            if not update.get('id') or not update.get('name') or not update.get('text'):
+                return False, "Prompt ID, name, and text are required"
+            error = self._validate_lengths(update['name'], update['text'])
+            if error:
+                return False, error
+            if self.prompt_manager.get_prompt(update['id']) is None:
+                return False, f"Prompt not found: {update['id']}"
+        
+        try:
+            for update in updates:
+                prompt = self.prompt_manager.get_prompt(update['id'])
+                self._apply_update(prompt, update['name'], update['text'],
+                                   update.get('category', prompt.category))
+            self._save()
+            return True, f"Successfully updated {len(updates)} prompts"
+        except Exception as e:
+            return False, f"Error updating prompts: {str(e)}"
+    
+    def reload(self):
+        """Re-read the prompts from storage, picking up changes made outside this service."""
+        self.prompt_manager.load_prompts()
+        self._invalidate()
+    
+    def _load_prompts(self) -> List[Dict]:
+        """Return the cached prompt dicts, building them from the manager on first use."""
+        if self._prompts is None:
+            self._prompts = [prompt.to_dict() for prompt in self.prompt_manager.list_prompts()]
+            self._by_id = {p['id']: p for p in self._prompts if p.get('id')}
+        return self._prompts
+    
+    def _invalidate(self):
+        """Drop the cached prompt dicts so the next read rebuilds them from the manager."""
+        self._prompts = None
+        self._prompts_tuple = None
+        self._by_id = {}
+        self._version += 1
+    
+    def _save(self):
+        """Save the manager's prompts, reloading the last saved ones if that fails."""
+        self._invalidate()
+        try:
+            if not self.prompt_manager.save_prompts():
+                raise IOError("prompts could not be saved")
+        except Exception:
+            self.prompt_manager.load_prompts()
+            raise
+    
+    @staticmethod
+    def _apply_update(prompt: Prompt, name: str, text: str, category: str):
+        prompt.name = name
+        prompt.category = category
+        prompt.update_text(text)  # also stamps modified_at
+    
+    @staticmethod
+    def _validate_lengths(name: str, text: str) -> Optional[str]:
+        if len(name) > 100:
+            return "Name must be 100 characters or less"
+        if len(text) > 5000:
+            return "Text must be 5000 characters or less"
+        return None
+    
     def delete_prompt(self, prompt_id: str) -> Tuple[bool, str]:
         """Delete a prompt."""
         if not prompt_id:
             return False, "Prompt ID is required"
         
         try:
-            all_prompts = self.get_all_prompts()
-            updated_prompts = [p for p in all_prompts if p.get('id') != prompt_id]
-            
-            if len(updated_prompts) == len(all_prompts):
+            self._load_prompts()
+            if prompt_id not in self._by_id:
                 return False, "Prompt not found"
             
-            self.prompt_manager.save_prompts(updated_prompts)
+            del self.prompt_manager.prompts[prompt_id]
+            self._save()
             return True, "Prompt deleted successfully"
         except Exception as e:
             return False, f"Error deleting prompt: {str(e)}"
     
     def get_prompt_by_id(self, prompt_id: str) -> Optional[Dict]:
         """Get a prompt by ID."""
-        all_prompts = self.get_all_prompts()
-        for prompt in all_prompts:
-            if prompt.get('id') == prompt_id:
-                return prompt
-        return None
+        self._load_prompts()
+        prompt = self._by_id.get(prompt_id)
+        return dict(prompt) if prompt is not None else None
     
     def export_prompts(self) -> str:
         """Export all prompts as JSON."""
-        prompts = self.get_all_prompts()
-        return json.dumps(prompts, indent=2)
+        return dumps_json(self._load_prompts(), indent=True)
     
     def import_prompts(self, json_data: str) -> Tuple[bool, str]:
         """Import prompts from JSON."""
@@ -133,8 +232,15 @@ class PromptService:
                 if 'name' not in prompt or 'text' not in prompt:
                     return False, "Prompt missing required fields"
             
-            # Import prompts
-            self.prompt_manager.save_prompts(prompts)
+            # Import prompts, replacing the current ones
+            imported = {}
+            for prompt_data in prompts:
+                prompt = Prompt(prompt_data['name'], prompt_data['text'],
+                                prompt_data.get('category', 'general'))
+                prompt.id = prompt_data.get('id') or str(uuid.uuid4())
+                imported[prompt.id] = prompt
+            self.prompt_manager.prompts = imported
+            self._save()
             return True, f"Successfully imported {len(prompts)} prompts"
         except json.JSONDecodeError:
             return False, "Invalid JSON format"
@@ -143,7 +249,7 @@ class PromptService:
     
     def get_categories(self) -> List[str]:
         """Get all unique categories."""
-        prompts = self.get_all_prompts()
+        prompts = self._load_prompts()
         categories = set()
         for prompt in prompts:
             category = prompt.get('category', 'Uncategorized')
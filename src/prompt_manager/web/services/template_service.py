@@ -5,22 +5,34 @@ Handles template processing, dropdown generation, and custom combo box integrati
 """
 
 import re
+from types import MappingProxyType
 from typing import Dict, Any, List
 from src.prompt_manager.business.custom_combo_box_integration import CustomComboBoxIntegration
 
 
+# Options shared by more than one variable
+_CODING_TASKS = ('Write code', 'Create tests', 'Refactor')
+_KITCHEN_TASKS = ('Shop for food', 'Prepare lunch')
+
+# Default dropdown options keyed by lowercase variable name.
+# Tuples so the shared defaults cannot be changed through a returned list.
+_DEFAULT_OPTIONS: Dict[str, tuple] = {
+    'role': ('Programmer', 'Chef', 'Soccer Coach', 'Teacher', 'Designer'),
+    'what': ('Write code', 'Shop for food', 'Create tests', 'Prepare lunch', 'Plan dinner party', 'Refactor'),
+    'why': ('Build better software', 'Cook delicious meals', 'Improve code quality', 'Feed my family', 'Host friends'),
+    'action': _CODING_TASKS + _KITCHEN_TASKS,
+    'context': ('Web development', 'Mobile app', 'Backend API', 'Kitchen', 'Restaurant')
+}
+
+_ADD_ITEM_PREFIX = ("Add item...",)
+
+
 class TemplateService:
     """Service for template processing and dropdown generation."""
     
     def __init__(self):
         self.custom_combo_integration = CustomComboBoxIntegration()
-        self.default_options = {
-            'role': ['Programmer', 'Chef', 'Soccer Coach', 'Teacher', 'Designer'],
-            'what': ['Write code', 'Shop for food', 'Create tests', 'Prepare lunch', 'Plan dinner party', 'Refactor'],
-            'why': ['Build better software', 'Cook delicious meals', 'Improve code quality', 'Feed my family', 'Host friends'],
-            'action': ['Write code', 'Create tests', 'Refactor', 'Shop for food', 'Prepare lunch'],
-            'context': ['Web development', 'Mobile app', 'Backend API', 'Kitchen', 'Restaurant']
-        }
+        self.default_options = MappingProxyType(_DEFAULT_OPTIONS)
     
     def extract_variables(self, template: str) -> List[str]:
         """Extract variables from template using regex."""
@@ -32,8 +44,10 @@ class TemplateService:
         
         dropdowns = {}
         for var in variables:
+            key = var if var.islower() else var.lower()
+            options = _DEFAULT_OPTIONS.get(key)
             dropdowns[var] = {
-                'options': self.default_options.get(var.lower(), [f'Option 1 for {var}', f'Option 2 for {var}']),
+                'options': list(options) if options is not None else [f'Option 1 for {var}', f'Option 2 for {var}'],
                 'placeholder': f'Select or enter {var}...'
             }
         
@@ -43,26 +57,20 @@ class TemplateService:
         """Generate custom dropdowns for edit mode."""
         custom_result = self.custom_combo_integration.create_template_with_custom_combo_boxes(template)
         
-        # Adapt to regular format for compatibility
-        dropdowns = {}
-        for combo_box in custom_result["combo_boxes"]:
-            tag = combo_box["tag"]
-            
-            # For custom combo boxes, always start with "Add item..." as first option
-            # Then add default options if none exist
-            default_options = [f"Option 1 for {tag}", f"Option 2 for {tag}"]
-            options = combo_box["options"] if combo_box["options"] else default_options
-            options_with_add = ["Add item..."] + options
-            
-            dropdowns[tag] = {
-                "options": options_with_add,
-                "enabled": combo_box["enabled"],
-                "value": combo_box["value"],
+        # Adapt to regular format for compatibility.
+        # Custom combo boxes always start with "Add item...", followed by
+        # their own options or two generated defaults if they have none.
+        return {
+            cb["tag"]: {
+                "options": [*_ADD_ITEM_PREFIX,
+                            *(cb["options"] or (f"Option 1 for {cb['tag']}", f"Option 2 for {cb['tag']}"))],
+                "enabled": cb["enabled"],
+                "value": cb["value"],
                 "is_custom": True,
                 "placeholder": "Type anything."
             }
-        
-        return dropdowns
+            for cb in custom_result["combo_boxes"]
+        }
     
     def generate_dropdowns(self, template: str, edit_mode: bool = False) -> Dict[str, Any]:
         """Generate dropdowns based on edit mode."""
@@ -74,11 +82,12 @@ class TemplateService:
     def update_dropdown_options(self, variable: str, context: str) -> List[str]:
         """Update dropdown options based on context."""
         # This could be enhanced with more sophisticated context-aware logic
-        base_options = self.default_options.get(variable.lower(), [])
+        key = variable if variable.islower() else variable.lower()
+        base_options = _DEFAULT_OPTIONS.get(key, ())
         if context:
             # Filter or enhance options based on context
             return [f"{context} - {option}" for option in base_options[:3]]
-        return base_options
+        return list(base_options)
     
     def generate_final_prompt(self, template: str, selections: Dict[str, str]) -> str:
         """Generate final prompt by replacing variables with selections."""
@@ -9,133 +9,132 @@ import json
 def test_custom_combo_functionality():
     """Test the custom combo box functionality."""
     base_url = "http://localhost:8000"
+    with requests.Session() as session:
+        print("🧪 Testing Custom Combo Box Functionality")
+        print("=" * 50)
     
-    print("🧪 Testing Custom Combo Box Functionality")
-    print("=" * 50)
-    
-    # Test 1: Check if test page loads
-    print("1. Testing page load...")
-    response = requests.get(f"{base_url}/custom-combo-test")
-    if response.status_code == 200:
-        print("   ✅ Test page loads successfully")
-        content = response.text
+        # Test 1: Check if test page loads
+        print("1. Testing page load...")
+        response = session.get(f"{base_url}/custom-combo-test")
+        if response.status_code == 200:
+            print("   ✅ Test page loads successfully")
+            content = response.text
         
-        # Check for key elements
-        if "Custom Combo Box Test" in content:
-            print("   ✅ Page title found")
-        if "Generate Test Combo Boxes" in content:
-            print("   ✅ Generate button found")
-        if "Mode: DISPLAY" in content:
-            print("   ✅ Mode toggle button found")
-    else:
-        print(f"   ❌ Test page failed to load: {response.status_code}")
-        return
+            # Check for key elements
+            if "Custom Combo Box Test" in content:
+                print("   ✅ Page title found")
+            if "Generate Test Combo Boxes" in content:
+                print("   ✅ Generate button found")
+            if "Mode: DISPLAY" in content:
+                print("   ✅ Mode toggle button found")
+        else:
+            print(f"   ❌ Test page failed to load: {response.status_code}")
+            return
     
-    print("\n2. Testing custom combo box behavior functions...")
+        print("\n2. Testing custom combo box behavior functions...")
     
-    # Check for custom combo box behavior functions
-    if "handleEnterKey" in content:
-        print("   ✅ Enter key handling found")
-    if "addOrUpdateItem" in content:
-        print("   ✅ Add/update item function found")
-    if "deleteSelectedItem" in content:
-        print("   ✅ Delete item function found")
-    if "showDropdown" in content and "hideDropdown" in content:
-        print("   ✅ Dropdown show/hide functions found")
-    if "selectItem" in content:
-        print("   ✅ Select item function found")
+        # Check for custom combo box behavior functions
+        if "handleEnterKey" in content:
+            print("   ✅ Enter key handling found")
+        if "addOrUpdateItem" in content:
+            print("   ✅ Add/update item function found")
+        if "deleteSelectedItem" in content:
+            print("   ✅ Delete item function found")
+        if "showDropdown" in content and "hideDropdown" in content:
+            print("   ✅ Dropdown show/hide functions found")
+        if "selectItem" in content:
+            print("   ✅ Select item function found")
     
-    print("\n3. Testing mode-specific behavior...")
+        print("\n3. Testing mode-specific behavior...")
     
-    # Check for mode-specific behavior
-    if "isEditMode" in content:
-        print("   ✅ Mode state variable found")
-    if "handleEditModeChange" in content or "editMode" in content:
-        print("   ✅ Edit mode handling found")
-    if "handleDisplayModeChange" in content or "displayMode" in content:
-        print("   ✅ Display mode handling found")
+        # Check for mode-specific behavior
+        if "isEditMode" in content:
+            print("   ✅ Mode state variable found")
+        if "handleEditModeChange" in content or "editMode" in content:
+            print("   ✅ Edit mode handling found")
+        if "handleDisplayModeChange" in content or "displayMode" in content:
+            print("   ✅ Display mode handling found")
     
-    print("\n4. Testing event listeners...")
+        print("\n4. Testing event listeners...")
     
-    # Check for event listeners
-    if "addEventListener('keydown'" in content:
-        print("   ✅ Keydown event listener found")
-    if "addEventListener('focus'" in content:
-        print("   ✅ Focus event listener found")
-    if "addEventListener('blur'" in content:
-        print("   ✅ Blur event listener found")
-    if "addEventListener('input'" in content:
-        print("   ✅ Input event listener found")
+        # Check for event listeners
+        if "addEventListener('keydown'" in content:
+            print("   ✅ Keydown event listener found")
+        if "addEventListener('focus'" in content:
+            print("   ✅ Focus event listener found")
+        if "addEventListener('blur'" in content:
+            print("   ✅ Blur event listener found")
+        if "addEventListener('input'" in content:
+            print("   ✅ Input event listener found")
     
-    print("\n5. Testing template generation integration...")
+        print("\n5. Testing template generation integration...")
     
-    # Test template generation with edit mode
-    test_data = {
-        "template": "As a [Role], I want to [What], so that [Why]",
-        "edit_mode": True
-    }
+        # Test template generation with edit mode
+        test_data = {
+            "template": "As a [Role], I want to [What], so that [Why]",
+            "edit_mode": True
+        }
     
-    response = requests.post(
-        f"{base_url}/template/generate",
-        json=test_data,
-        headers={"Content-Type": "application/json"}
-    )
+        response = session.post(
+            f"{base_url}/template/generate",
+            json=test_data
+        )
     
-    if response.status_code == 200:
-        data = response.json()
-        print("   ✅ Template generation works")
+        if response.status_code == 200:
+            data = response.json()
+            print("   ✅ Template generation works")
         
-        if "dropdowns" in data:
-            print("   ✅ Dropdowns generated")
+            if "dropdowns" in data:
+                print("   ✅ Dropdowns generated")
             
-            # Check if we have the custom properties
-            role_dropdown = data["dropdowns"].get("Role", {})
-            if role_dropdown.get("is_custom"):
-                print("   ✅ Custom combo box properties found")
-                if "Add item..." in str(role_dropdown.get("options", [])):
-                    print("   ✅ Edit mode: 'Add item...' in options")
-                if "Type anything." in role_dropdown.get("placeholder", ""):
-                    print("   ✅ Edit mode: 'Type anything.' placeholder")
-            else:
-                print("   ⚠️  Custom combo box properties not found")
-    else:
-        print(f"   ❌ Template generation failed: {response.status_code}")
+                # Check if we have the custom properties
+                role_dropdown = data["dropdowns"].get("Role", {})
+                if role_dropdown.get("is_custom"):
+                    print("   ✅ Custom combo box properties found")
+                    if "Add item..." in str(role_dropdown.get("options", [])):
+                        print("   ✅ Edit mode: 'Add item...' in options")
+                    if "Type anything." in role_dropdown.get("placeholder", ""):
+                        print("   ✅ Edit mode: 'Type anything.' placeholder")
+                else:
+                    print("   ⚠️  Custom combo box properties not found")
+        else:
+            print(f"   ❌ Template generation failed: {response.status_code}")
     
-    print("\n🎯 Summary:")
-    print("   - All custom combo box behavior functions implemented ✅")
-    print("   - Enter key handling for add/edit/delete ✅")
-    print("   - Dropdown show/hide on focus/blur ✅")
-    print("   - Mode-specific behavior (edit vs display) ✅")
-    print("   - Event listeners properly configured ✅")
-    print("   - Server integration works ✅")
+        print("\n🎯 Summary:")
+        print("   - All custom combo box behavior functions implemented ✅")
+        print("   - Enter key handling for add/edit/delete ✅")
+        print("   - Dropdown show/hide on focus/blur ✅")
+        print("   - Mode-specific behavior (edit vs display) ✅")
+        print("   - Event listeners properly configured ✅")
+        print("   - Server integration works ✅")
     
-    print(f"\n🌐 Ready for Manual Testing:")
-    print(f"   Visit: {base_url}/custom-combo-test")
-    print("   Steps:")
-    print("   1. Click 'Generate Test Combo Boxes'")
-    print("   2. Verify combo boxes appear with proper structure")
-    print("   3. Test Edit Mode:")
-    print("      - Click mode toggle to EDIT mode")
-    print("      - Type 'New Role' and press Enter")
-    print("      - Verify item is added to dropdown")
-    print("      - Select an item, modify it, press Enter")
-    print("      - Verify item is updated")
-    print("      - Select an item, clear field, press Enter")
-    print("      - Verify item is deleted")
-    print("   4. Test Display Mode:")
-    print("      - Click mode toggle to DISPLAY mode")
-    print("      - Verify first item is 'Select item'")
-    print("      - Verify placeholder is 'Select Role'")
-    print("      - Try to add items (should not work)")
-    print("      - Verify only selection works")
+        print(f"\n🌐 Ready for Manual Testing:")
+        print(f"   Visit: {base_url}/custom-combo-test")
+        print("   Steps:")
+        print("   1. Click 'Generate Test Combo Boxes'")
+        print("   2. Verify combo boxes appear with proper structure")
+        print("   3. Test Edit Mode:")
+        print("      - Click mode toggle to EDIT mode")
+        print("      - Type 'New Role' and press Enter")
+        print("      - Verify item is added to dropdown")
+        print("      - Select an item, modify it, press Enter")
+        print("      - Verify item is updated")
+        print("      - Select an item, clear field, press Enter")
+        print("      - Verify item is deleted")
+        print("   4. Test Display Mode:")
+        print("      - Click mode toggle to DISPLAY mode")
+        print("      - Verify first item is 'Select item'")
+        print("      - Verify placeholder is 'Select Role'")
+        print("      - Try to add items (should not work)")
+        print("      - Verify only selection works")
     
-    print("\n🔍 What to Look For:")
-    print("   - Combo boxes show proper HTML structure")
-    print("   - Enter key adds/edits/deletes items in edit mode")
-    print("   - Dropdown shows/hides on focus/blur")
-    print("   - Mode switching changes behavior correctly")
-    print("   - No JavaScript errors in browser console")
-    print("   - Smooth user experience")
+        print("\n🔍 What to Look For:")
+        print("   - Combo boxes show proper HTML structure")
+        print("   - Enter key adds/edits/deletes items in edit mode")
+        print("   - Dropdown shows/hides on focus/blur")
+        print("   - Mode switching changes behavior correctly")
+        print("   - No JavaScript errors in browser console")
+        print("   - Smooth user experience")
 
 if __name__ == "__main__":
     test_custom_combo_functionality()
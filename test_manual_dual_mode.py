@@ -9,113 +9,112 @@ import json
 def test_manual_dual_mode():
     """Test the dual-mode behavior manually."""
     base_url = "http://localhost:8000"
+    with requests.Session() as session:
+        print("🧪 Manual Testing: Dual-Mode Behavior")
+        print("=" * 50)
     
-    print("🧪 Manual Testing: Dual-Mode Behavior")
-    print("=" * 50)
-    
-    # Test 1: Check if test page loads
-    print("1. Testing page load...")
-    response = requests.get(f"{base_url}/custom-combo-test")
-    if response.status_code == 200:
-        print("   ✅ Test page loads successfully")
-        content = response.text
+        # Test 1: Check if test page loads
+        print("1. Testing page load...")
+        response = session.get(f"{base_url}/custom-combo-test")
+        if response.status_code == 200:
+            print("   ✅ Test page loads successfully")
+            content = response.text
         
-        # Check for key elements
-        if "Custom Combo Box Test" in content:
-            print("   ✅ Page title found")
-        if "mode-toggle" in content:
-            print("   ✅ Mode toggle button found")
-        if "Generate Test Combo Boxes" in content:
-            print("   ✅ Generate button found")
-    else:
-        print(f"   ❌ Test page failed to load: {response.status_code}")
-        return
+            # Check for key elements
+            if "Custom Combo Box Test" in content:
+                print("   ✅ Page title found")
+            if "mode-toggle" in content:
+                print("   ✅ Mode toggle button found")
+            if "Generate Test Combo Boxes" in content:
+                print("   ✅ Generate button found")
+        else:
+            print(f"   ❌ Test page failed to load: {response.status_code}")
+            return
     
-    print("\n2. Testing mode-specific JavaScript functions...")
+        print("\n2. Testing mode-specific JavaScript functions...")
     
-    # Check for mode-specific functions
-    if "getModeOptions" in content:
-        print("   ✅ getModeOptions function found")
-    if "getModePlaceholder" in content:
-        print("   ✅ getModePlaceholder function found")
-    if "toggleMode" in content:
-        print("   ✅ toggleMode function found")
-    if "isEditMode" in content:
-        print("   ✅ isEditMode variable found")
+        # Check for mode-specific functions
+        if "getModeOptions" in content:
+            print("   ✅ getModeOptions function found")
+        if "getModePlaceholder" in content:
+            print("   ✅ getModePlaceholder function found")
+        if "toggleMode" in content:
+            print("   ✅ toggleMode function found")
+        if "isEditMode" in content:
+            print("   ✅ isEditMode variable found")
     
-    print("\n3. Testing mode-specific logic...")
+        print("\n3. Testing mode-specific logic...")
     
-    # Check for edit mode logic
-    if "Add item" in content:
-        print("   ✅ Edit mode: 'Add item' found")
-    if "Enter ${tag}" in content or "Enter Role" in content:
-        print("   ✅ Edit mode: 'Enter' placeholder found")
+        # Check for edit mode logic
+        if "Add item" in content:
+            print("   ✅ Edit mode: 'Add item' found")
+        if "Enter ${tag}" in content or "Enter Role" in content:
+            print("   ✅ Edit mode: 'Enter' placeholder found")
     
-    # Check for display mode logic
-    if "Select item" in content:
-        print("   ✅ Display mode: 'Select item' found")
-    if "Select ${tag}" in content or "Select Role" in content:
-        print("   ✅ Display mode: 'Select' placeholder found")
+        # Check for display mode logic
+        if "Select item" in content:
+            print("   ✅ Display mode: 'Select item' found")
+        if "Select ${tag}" in content or "Select Role" in content:
+            print("   ✅ Display mode: 'Select' placeholder found")
     
-    print("\n4. Testing template generation integration...")
+        print("\n4. Testing template generation integration...")
     
-    # Test template generation with edit mode
-    test_data = {
-        "template": "As a [Role], I want to [What], so that [Why]",
-        "edit_mode": True
-    }
+        # Test template generation with edit mode
+        test_data = {
+            "template": "As a [Role], I want to [What], so that [Why]",
+            "edit_mode": True
+        }
     
-    response = requests.post(
-        f"{base_url}/template/generate",
-        json=test_data,
-        headers={"Content-Type": "application/json"}
-    )
+        response = session.post(
+            f"{base_url}/template/generate",
+            json=test_data
+        )
     
-    if response.status_code == 200:
-        data = response.json()
-        print("   ✅ Template generation works")
+        if response.status_code == 200:
+            data = response.json()
+            print("   ✅ Template generation works")
         
-        if "dropdowns" in data:
-            print("   ✅ Dropdowns generated")
+            if "dropdowns" in data:
+                print("   ✅ Dropdowns generated")
             
-            # Check if we have the custom properties
-            role_dropdown = data["dropdowns"].get("Role", {})
-            if role_dropdown.get("is_custom"):
-                print("   ✅ Custom combo box properties found")
-                if "Add item..." in str(role_dropdown.get("options", [])):
-                    print("   ✅ Edit mode: 'Add item...' in options")
-                if "Type anything." in role_dropdown.get("placeholder", ""):
-                    print("   ✅ Edit mode: 'Type anything.' placeholder")
-            else:
-                print("   ⚠️  Custom combo box properties not found")
-    else:
-        print(f"   ❌ Template generation failed: {response.status_code}")
+                # Check if we have the custom properties
+                role_dropdown = data["dropdowns"].get("Role", {})
+                if role_dropdown.get("is_custom"):
+                    print("   ✅ Custom combo box properties found")
+                    if "Add item..." in str(role_dropdown.get("options", [])):
+                        print("   ✅ Edit mode: 'Add item...' in options")
+                    if "Type anything." in role_dropdown.get("placeholder", ""):
+                        print("   ✅ Edit mode: 'Type anything.' placeholder")
+                else:
+                    print("   ⚠️  Custom combo box properties not found")
+        else:
+            print(f"   ❌ Template generation failed: {response.status_code}")
     
-    print("\n🎯 Summary:")
-    print("   - All tests pass ✅")
-    print("   - Mode switching logic is implemented ✅")
-    print("   - Mode-specific first items are configured ✅")
-    print("   - Mode-specific placeholders are configured ✅")
-    print("   - Server integration works ✅")
+        print("\n🎯 Summary:")
+        print("   - All tests pass ✅")
+        print("   - Mode switching logic is implemented ✅")
+        print("   - Mode-specific first items are configured ✅")
+        print("   - Mode-specific placeholders are configured ✅")
+        print("   - Server integration works ✅")
     
-    print(f"\n🌐 Ready for Manual Testing:")
-    print(f"   Visit: {base_url}/custom-combo-test")
-    print("   Steps:")
-    print("   1. Click 'Generate Test Combo Boxes'")
-    print("   2. Verify initial state (should be DISPLAY mode)")
-    print("   3. Click mode toggle to switch to EDIT mode")
-    print("   4. Verify first item changes to 'Add item'")
-    print("   5. Verify placeholder changes to 'Enter Role'")
-    print("   6. Click mode toggle to switch back to DISPLAY mode")
-    print("   7. Verify first item changes to 'Select item'")
-    print("   8. Verify placeholder changes to 'Select Role'")
+        print(f"\n🌐 Ready for Manual Testing:")
+        print(f"   Visit: {base_url}/custom-combo-test")
+        print("   Steps:")
+        print("   1. Click 'Generate Test Combo Boxes'")
+        print("   2. Verify initial state (should be DISPLAY mode)")
+        print("   3. Click mode toggle to switch to EDIT mode")
+        print("   4. Verify first item changes to 'Add item'")
+        print("   5. Verify placeholder changes to 'Enter Role'")
+        print("   6. Click mode toggle to switch back to DISPLAY mode")
+        print("   7. Verify first item changes to 'Select item'")
+        print("   8. Verify placeholder changes to 'Select Role'")
     
-    print("\n🔍 What to Look For:")
-    print("   - Mode toggle button changes appearance and text")
-    print("   - First dropdown item changes between modes")
-    print("   - Placeholder text changes between modes")
-    print("   - No JavaScript errors in browser console")
-    print("   - Smooth transitions between modes")
+        print("\n🔍 What to Look For:")
+        print("   - Mode toggle button changes appearance and text")
+        print("   - First dropdown item changes between modes")
+        print("   - Placeholder text changes between modes")
+        print("   - No JavaScript errors in browser console")
+        print("   - Smooth transitions between modes")
 
 if __name__ == "__main__":
     test_manual_dual_mode()
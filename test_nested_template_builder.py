@@ -1,20 +1,115 @@
 # test_nested_template_builder.py
 # 🔴 RED: Failing test for nested template dependencies
 
+import re
+import itertools
 import pytest
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Iterator, Mapping, Optional, Tuple
 
 # ============================================================================
 # Nested Template System
 # ============================================================================
 
+_PLACEHOLDER = re.compile(r'\[([^\]]+)\]')
+
+def _freeze_options(value):
+    """Turn option lists into tuples and dicts into read-only mappings; other values pass through"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze_options(options) for key, options in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return value
+
 class NestedPromptTemplate:
-    """A template with nested dependencies between variables"""
+    """A template with nested dependencies between variables
+    
+    The pattern, variables and dependencies are read-only once the template
+    is built, so the options cached from them can't go stale.
+    """
     
-    def __init__(self, name: str, pattern: str, variables: Dict[str, any]):
+    def __init__(self, name: str, pattern: str, variables: Dict[str, any],
+                 dependencies: Optional[Dict[str, str]] = None):
         self.name = name
-        self.pattern = pattern  # "As a [role], I want to [what], so I can [why]"
-        self.variables = variables  # {"role": ["dev", "manager"], "what": {"dev": [...], "manager": [...]}}
+        self._pattern = pattern  # "As a [role], I want to [what], so I can [why]"
+        self._variables = _freeze_options(variables)  # {"role": ["dev", "manager"], "what": {"dev": [...], "manager": [...]}}
+        self._dependencies = MappingProxyType(dict(dependencies or {}))  # {"what": "role"}; inferred when omitted
+        self._options_cache: Dict[tuple, Tuple[str, ...]] = {}
+        self._parts = self._compile_pattern(pattern)
+        self._index_variables()
+    
+    @property
+    def pattern(self) -> str:
+        """The pattern the prompt is built from"""
+        return self._pattern
+    
+    @property
+    def variables(self) -> Mapping[str, any]:
+        """The variable definitions, with option lists as tuples and dicts as read-only mappings"""
+        return self._variables
+    
+    @property
+    def dependencies(self) -> Mapping[str, str]:
+        """The declared parent of each dependent variable"""
+        return self._dependencies
+    
+    @staticmethod
+    def _compile_pattern(pattern: str) -> Tuple[str, ...]:
+        """Split "As a [role]!" into ("As a ", "role", "!") - variable names at the odd indexes"""
+        return tuple(_PLACEHOLDER.split(pattern))
+    
+    def build_prompt(self, values: Dict[str, str]) -> str:
+        """Build the prompt by filling in the pattern's variables"""
+        parts = self._parts
+        if len(parts) == 1:
+            return self.pattern
+        filled = list(parts)
+        try:
+            for i in range(1, len(parts), 2):
+                filled[i] = values[parts[i]]
+        except KeyError as e:
+            raise ValueError(f"Missing required variable: {e}")
+        return "".join(filled)
+    
+    def _index_variables(self):
+        """Precompute per-variable lookups so queries don't re-walk the definitions"""
+        self._list_vars: Dict[str, Tuple[str, ...]] = {}
+        self._dict_vars: Dict[str, Mapping] = {}
+        self._all_options: Dict[str, Tuple[str, ...]] = {}
+        for name, variable_def in self.variables.items():
+            if isinstance(variable_def, tuple):
+                self._list_vars[name] = variable_def
+                continue
+            if not isinstance(variable_def, Mapping):
+                continue  # Not an option list or a nested definition, so it has no options
+            self._dict_vars[name] = variable_def
+            all_options = []
+            for options in variable_def.values():
+                if isinstance(options, tuple):
+                    all_options.extend(options)
+                elif isinstance(options, Mapping):
+                    for sub_options in options.values():
+                        if isinstance(sub_options, tuple):
+                            all_options.extend(sub_options)
+            self._all_options[name] = tuple(all_options)
+        
+        self._depends_on: Dict[str, str] = {}
+        for name, variable_def in self._dict_vars.items():
+            parent = self.dependencies.get(name) or self._infer_parent(name, variable_def)
+            if parent:
+                self._depends_on[name] = parent
+    
+    def _infer_parent(self, variable_name: str, variable_def: Mapping) -> Optional[str]:
+        """Guess the parent as the variable whose options best match this one's keys"""
+        best_parent, best_overlap = None, 0
+        for name in self.variables:
+            if name == variable_name:
+                continue
+            options = self._list_vars.get(name) or self._all_options.get(name, ())
+            overlap = sum(1 for option in options if option in variable_def)
+            if overlap > best_overlap:
+                best_parent, best_overlap = name, overlap
+        return best_parent
     
     def get_available_variables(self) -> List[str]:
         """Get list of variable names that can be filled"""
@@ -22,44 +117,141 @@ class NestedPromptTemplate:
     
     def get_options_for_variable(self, variable_name: str, context: Dict[str, str] = None) -> List[str]:
         """Get available options for a specific variable, considering dependencies"""
-        if variable_name not in self.variables:
-            return []
+        return list(self._options_for_variable(variable_name, context))
+    
+    def get_options_for_parent(self, variable_name: str, parent_value: str) -> List[str]:
+        """Get the options for a variable given the value chosen for its parent
         
-        variable_def = self.variables[variable_name]
+        Independent variables ignore parent_value.
+        """
+        return list(self._options_for_parent(variable_name, parent_value))
+    
+    def _options_for_variable(self, variable_name: str, context: Optional[Dict[str, str]]) -> Tuple[str, ...]:
+        """Options for a variable, cached per (variable, context); the tuple is shared"""
+        # Independent variables are the common case and need no context
+        options = self._list_vars.get(variable_name)
+        if options is not None:
+            return options
+        
+        # Dependent variables only need their parent's value
+        if context:
+            options = self._options_by_parent(variable_name, context)
+            if options is not None:
+                return options
         
-        # If it's a simple list, return all options
-        if isinstance(variable_def, list):
-            return variable_def
+        try:
+            key = (variable_name, frozenset(context.items()) if context else None)
+            options = self._options_cache.get(key)
+        except TypeError:
+            # Unhashable context values can't be cached
+            return tuple(self._resolve_options(variable_name, context))
         
-        # If it's a nested dict, filter based on context
-        if isinstance(variable_def, dict) and context:
-            # Find the first dependency that matches
-            for dep_var, dep_value in context.items():
-                # Check if this variable depends on the context variable
-                if dep_value in variable_def:
-                    return variable_def[dep_value]
-            # If no context matches, return empty list
+        if options is None:
+            options = self._options_cache[key] = tuple(self._resolve_options(variable_name, context))
+        return options
+    
+    def _options_for_parent(self, variable_name: str, parent_value: str) -> Tuple[str, ...]:
+        variable_def = self._dict_vars.get(variable_name)
+        if variable_def is None:
+            return self._list_vars.get(variable_name, ())
+        return variable_def.get(parent_value, ())
+    
+    def _options_by_parent(self, variable_name: str, context: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+        """Options keyed by the parent's value in context, or None when that gives no match"""
+        parent = self._depends_on.get(variable_name)
+        if parent is None or parent not in context:
+            return None
+        return self._dict_vars[variable_name].get(context[parent])
+    
+    def _resolve_options(self, variable_name: str, context: Optional[Dict[str, str]]):
+        """Work out the options for a variable from its definition"""
+        variable_def = self._dict_vars.get(variable_name)
+        if variable_def is None:
             return []
         
         # If it's a nested dict but no context, return all options
-        if isinstance(variable_def, dict):
-            all_options = []
-            for key, options in variable_def.items():
-                if isinstance(options, list):
-                    all_options.extend(options)
-            return all_options
+        if not context:
+            return self._all_options[variable_name]
         
-        # Fallback: return all options from nested structure
-        all_options = []
-        if isinstance(variable_def, dict):
-            for key, options in variable_def.items():
-                if isinstance(options, list):
-                    all_options.extend(options)
-                elif isinstance(options, dict):
-                    for sub_options in options.values():
-                        if isinstance(sub_options, list):
-                            all_options.extend(sub_options)
-        return all_options
+        # If it's a nested dict, look up the parent's chosen value directly
+        options = self._options_by_parent(variable_name, context)
+        if options is not None:
+            return options
+        
+        # Unknown dependency or no match for the parent: find the first context value that matches
+        for dep_var, dep_value in context.items():
+            # Check if this variable depends on the context variable
+            if dep_value in variable_def:
+                return variable_def[dep_value]
+        # If no context matches, return empty list
+        return []
+    
+    def build_combination_trie(self, variable_order: List[str],
+                               context_root: Dict[str, str] = None) -> Dict[str, tuple]:
+        """Build a tree of every valid combination of values for variable_order
+        
+        Each node maps a chosen value to (options for the next variable, child node),
+        so options for a shared prefix like {role: developer} are resolved once.
+        context_root holds values already chosen for variables outside the order.
+        """
+        if not variable_order:
+            return {}
+        root_options = self._options_for_variable(variable_order[0], context_root)
+        return self._build_trie_level(variable_order, 0, root_options, dict(context_root or {}))
+    
+    def _build_trie_level(self, variable_order: List[str], depth: int,
+                          options: Tuple[str, ...], context: Dict[str, str]) -> Dict[str, tuple]:
+        node = {}
+        variable = variable_order[depth]
+        is_last = depth + 1 == len(variable_order)
+        next_variable = None if is_last else variable_order[depth + 1]
+        # When the next variable hangs off this one, skip the context lookup
+        by_parent = not is_last and (next_variable in self._list_vars
+                                     or self._depends_on.get(next_variable) == variable)
+        next_def = self._dict_vars.get(next_variable)
+        for value in options:
+            context[variable] = value
+            if is_last:
+                node[value] = ((), {})
+            else:
+                # A value with no entry of its own falls back to the full context lookup
+                next_options = (self._options_for_parent(next_variable, value)
+                                if by_parent and (next_def is None or value in next_def)
+                                else self._options_for_variable(next_variable, context))
+                node[value] = (next_options,
+                               self._build_trie_level(variable_order, depth + 1, next_options, context))
+        context.pop(variable, None)
+        return node
+    
+    def iter_combinations(self, variable_order: List[str],
+                          context_root: Dict[str, str] = None) -> Iterator[Dict[str, str]]:
+        """Yield every valid combination of values for variable_order
+        
+        Independent variables are crossed with itertools.product; dependent ones
+        are enumerated through the combination trie.
+        """
+        if all(name in self._list_vars for name in variable_order):
+            option_tuples = [self._list_vars[name] for name in variable_order]
+            for values in itertools.product(*option_tuples):
+                yield dict(zip(variable_order, values))
+            return
+        trie = self.build_combination_trie(variable_order, context_root)
+        yield from self.walk_combination_trie(trie, variable_order)
+    
+    @staticmethod
+    def walk_combination_trie(trie: Dict[str, tuple], variable_order: List[str]) -> Iterator[Dict[str, str]]:
+        """Yield each complete combination in a trie from build_combination_trie"""
+        chosen: Dict[str, str] = {}
+        
+        def walk(node, depth):
+            if depth == len(variable_order):
+                yield dict(chosen)
+                return
+            for value, (_, child) in node.items():
+                chosen[variable_order[depth]] = value
+                yield from walk(child, depth + 1)
+        
+        yield from walk(trie, 0)
 
 # ============================================================================
 # Tests
@@ -294,6 +486,347 @@ class TestNestedTemplateBuilder:
         
         # Then: Should return only create mockups tool options
         assert tool_options == ["Figma", "Sketch", "Adobe XD"]
+    
+    def test_repeated_queries_are_not_affected_by_callers(self):
+        """Test that changing one query's result doesn't change the next one's"""
+        # Given: A template with a dependent variable
+        template = NestedPromptTemplate(
+            name="User Story",
+            pattern="As a [role], I want to [what]",
+            variables={
+                "role": ["developer", "manager"],
+                "what": {
+                    "developer": ["write code", "debug"],
+                    "manager": ["approve", "coordinate"]
+                }
+            }
+        )
+        
+        # When: Changing the options from the first query and asking again
+        first = template.get_options_for_variable("what", {"role": "developer"})
+        first.append("deploy")
+        second = template.get_options_for_variable("what", {"role": "developer"})
+        
+        # Then: Should get the stored options back
+        assert second == ["write code", "debug"]
+    
+    def test_variables_cannot_be_changed_after_construction(self):
+        """Test that a template's definitions are read-only, so cached options can't go stale"""
+        # Given: A template whose options have been queried
+        template = NestedPromptTemplate(
+            name="Roles",
+            pattern="As a [role], I want to [what]",
+            variables={"role": ["developer", "manager"], "what": {"developer": ["write code"]}}
+        )
+        template.get_options_for_variable("role")
+        
+        # When/Then: Changing the definitions should fail
+        with pytest.raises(TypeError):
+            template.variables["role"] = ["designer"]
+        with pytest.raises(TypeError):
+            template.variables["what"]["manager"] = ["plan"]
+        with pytest.raises(AttributeError):
+            template.variables = {"role": ["designer"]}
+        with pytest.raises(AttributeError):
+            template.pattern = "As a [role]"
+        
+        # And: The options should be unchanged
+        assert template.get_options_for_variable("role") == ["developer", "manager"]
+    
+    def test_empty_context_flattens_two_level_nesting(self):
+        """Test that all options are found for variables nested two levels deep"""
+        # Given: A variable whose options are grouped twice
+        template = NestedPromptTemplate(
+            name="Tools",
+            pattern="Use [tool]",
+            variables={
+                "tool": {
+                    "developer": {"write code": ["VS Code", "Vim"], "debug": ["logging"]},
+                    "designer": ["Figma"]
+                }
+            }
+        )
+        
+        # When: Getting options with no context
+        options = template.get_options_for_variable("tool")
+        
+        # Then: Should include every leaf option
+        assert options == ["VS Code", "Vim", "logging", "Figma"]
+    
+    def test_independent_variable_ignores_context(self):
+        """Test that context doesn't change the options of an independent variable"""
+        # Given: A template with an independent variable
+        template = NestedPromptTemplate(
+            name="Environments",
+            pattern="Deploy to [environment]",
+            variables={"environment": ["production", "staging"]}
+        )
+        
+        # When: Getting options with and without context
+        without_context = template.get_options_for_variable("environment")
+        with_context = template.get_options_for_variable("environment", {"role": "developer"})
+        
+        # Then: Should return the same options
+        assert without_context == ["production", "staging"]
+        assert with_context == without_context
+    
+    def test_parent_is_inferred_from_matching_options(self):
+        """Test that a dependent variable's parent is inferred from the other variables"""
+        # Given: A template with cascading dependencies
+        template = NestedPromptTemplate(
+            name="Deep Nested Template",
+            pattern="As a [role], I want to [what] using [tool]",
+            variables={
+                "role": ["developer", "designer"],
+                "what": {
+                    "developer": ["write code", "debug"],
+                    "designer": ["create mockups"]
+                },
+                "tool": {
+                    "write code": ["VS Code", "Vim"],
+                    "debug": ["logging"],
+                    "create mockups": ["Figma"]
+                }
+            }
+        )
+        
+        # When/Then: Each dependent variable should be looked up by its parent's value
+        assert template.get_options_for_parent("what", "developer") == ["write code", "debug"]
+        assert template.get_options_for_parent("tool", "write code") == ["VS Code", "Vim"]
+    
+    def test_declared_parent_wins_over_other_matching_context_values(self):
+        """Test that only the parent's value is used when other context values also match"""
+        # Given: A template with an explicit dependency
+        template = NestedPromptTemplate(
+            name="Pairing",
+            pattern="As a [role] pairing with a [mentor], I want to [what]",
+            variables={
+                "role": ["developer", "tester"],
+                "mentor": ["developer", "tester"],
+                "what": {
+                    "developer": ["write code"],
+                    "tester": ["write tests"]
+                }
+            },
+            dependencies={"what": "role"}
+        )
+        
+        # When: The mentor's value would also match a key of what
+        options = template.get_options_for_variable("what", {"mentor": "tester", "role": "developer"})
+        
+        # Then: Should use the role's options
+        assert options == ["write code"]
+    
+    def test_unmatched_parent_value_falls_back_to_other_context_values(self):
+        """Test that a parent value with no options falls back to scanning the context"""
+        # Given: A template whose inferred parent is role
+        template = NestedPromptTemplate(
+            name="Pairing",
+            pattern="As a [role] pairing with a [mentor], I want to [what]",
+            variables={
+                "role": ["developer", "tester", "manager"],
+                "mentor": ["developer", "tester"],
+                "what": {
+                    "developer": ["write code"],
+                    "tester": ["write tests"]
+                }
+            }
+        )
+        
+        # When: The role has no entry but the mentor's value does
+        options = template.get_options_for_variable("what", {"role": "manager", "mentor": "tester"})
+        
+        # Then: Should use the first matching context value, as before inference
+        assert options == ["write tests"]
+    
+    def test_combination_trie_yields_every_cascading_combination(self):
+        """Test enumerating all valid combinations of cascading variables"""
+        # Given: A template with cascading dependencies
+        template = NestedPromptTemplate(
+            name="Deep Nested Template",
+            pattern="As a [role], I want to [what] using [tool]",
+            variables={
+                "role": ["developer", "designer"],
+                "what": {
+                    "developer": ["write code", "debug"],
+                    "designer": ["create mockups"]
+                },
+                "tool": {
+                    "write code": ["VS Code", "Vim"],
+                    "debug": ["logging"],
+                    "create mockups": ["Figma"]
+                }
+            }
+        )
+        order = ["role", "what", "tool"]
+        
+        # When: Building and walking the combination trie
+        trie = template.build_combination_trie(order)
+        combinations = list(template.walk_combination_trie(trie, order))
+        
+        # Then: Each node should carry the next options and every path is a combination
+        assert trie["developer"][0] == ("write code", "debug")
+        assert combinations == [
+            {"role": "developer", "what": "write code", "tool": "VS Code"},
+            {"role": "developer", "what": "write code", "tool": "Vim"},
+            {"role": "developer", "what": "debug", "tool": "logging"},
+            {"role": "designer", "what": "create mockups", "tool": "Figma"},
+        ]
+    
+    def test_iter_combinations_crosses_independent_variables(self):
+        """Test enumerating combinations of independent variables in order"""
+        # Given: A template with two independent variables
+        template = NestedPromptTemplate(
+            name="Greeting",
+            pattern="[greeting], [name]",
+            variables={"greeting": ["Hi", "Hello"], "name": ["Ann", "Bob"]}
+        )
+        
+        # When: Iterating over every combination
+        combinations = list(template.iter_combinations(["greeting", "name"]))
+        
+        # Then: Should match the nested-loop order
+        assert combinations == [
+            {"greeting": "Hi", "name": "Ann"},
+            {"greeting": "Hi", "name": "Bob"},
+            {"greeting": "Hello", "name": "Ann"},
+            {"greeting": "Hello", "name": "Bob"},
+        ]
+    
+    def test_iter_combinations_follows_dependencies_from_root_context(self):
+        """Test enumerating dependent variables below an already chosen value"""
+        # Given: A template with cascading dependencies
+        template = NestedPromptTemplate(
+            name="Deep Nested Template",
+            pattern="As a [role], I want to [what] using [tool]",
+            variables={
+                "role": ["developer", "designer"],
+                "what": {
+                    "developer": ["write code", "debug"],
+                    "designer": ["create mockups"]
+                },
+                "tool": {
+                    "write code": ["VS Code"],
+                    "debug": ["logging"],
+                    "create mockups": ["Figma"]
+                }
+            }
+        )
+        
+        # When: Iterating below a chosen role
+        combinations = list(template.iter_combinations(["what", "tool"], {"role": "developer"}))
+        
+        # Then: Should only include that role's branch
+        assert combinations == [
+            {"what": "write code", "tool": "VS Code"},
+            {"what": "debug", "tool": "logging"},
+        ]
+    
+    def test_option_lists_are_frozen_into_tuples(self):
+        """Test that option lists are stored as tuples"""
+        # Given: A template built from plain option lists
+        template = NestedPromptTemplate(
+            name="User Story",
+            pattern="As a [role], I want to [what]",
+            variables={
+                "role": ["developer", "manager"],
+                "what": {"developer": ["write code"], "manager": ["plan"]}
+            }
+        )
+        
+        # When/Then: Should store tuples and still hand back lists
+        assert template.variables["role"] == ("developer", "manager")
+        assert template.variables["what"]["developer"] == ("write code",)
+        assert template.get_options_for_variable("role") == ["developer", "manager"]
+    
+    def test_scalar_variable_values_are_kept_as_is(self):
+        """Test that freezing leaves values that aren't option lists alone"""
+        # Given: A template whose definitions hold a string and None
+        template = NestedPromptTemplate(
+            name="Scalars",
+            pattern="As a [role]",
+            variables={"role": "developer", "what": {"developer": None}}
+        )
+        
+        # When/Then: Should keep them unchanged, and a string is not a list of options
+        assert template.variables["role"] == "developer"
+        assert template.variables["what"]["developer"] is None
+        assert template.get_options_for_variable("role") == []
+    
+    def test_get_options_for_parent_matches_context_lookup(self):
+        """Test looking up options by the parent's value alone"""
+        # Given: A template with an independent and a dependent variable
+        template = NestedPromptTemplate(
+            name="User Story",
+            pattern="As a [role], I want to [what]",
+            variables={
+                "role": ["developer", "manager"],
+                "what": {
+                    "developer": ["write code", "debug"],
+                    "manager": ["approve"]
+                }
+            }
+        )
+        
+        # When/Then: Should agree with the context-based lookup
+        assert template.get_options_for_parent("what", "developer") == ["write code", "debug"]
+        assert (template.get_options_for_parent("what", "manager")
+                == template.get_options_for_variable("what", {"role": "manager"}))
+        assert template.get_options_for_parent("what", "designer") == []
+        assert template.get_options_for_parent("role", "anything") == ["developer", "manager"]
+        assert template.get_options_for_parent("missing", "developer") == []
+    
+    def test_build_prompt_fills_pattern_variables(self):
+        """Test building a prompt from the bracketed pattern"""
+        # Given: A template with bracketed variables and literal braces
+        template = NestedPromptTemplate(
+            name="User Story",
+            pattern="As a [role], I want to [what] {quickly}",
+            variables={"role": ["developer"], "what": {"developer": ["write code"]}}
+        )
+        
+        # When: Building with values for every variable
+        result = template.build_prompt({"role": "developer", "what": "write code"})
+        
+        # Then: Should fill the variables and keep the braces
+        assert result == "As a developer, I want to write code {quickly}"
+    
+    def test_build_prompt_fills_variables_with_spaces_and_punctuation(self):
+        """Test that any bracketed name is a variable, as elsewhere in the repo"""
+        # Given: A template whose variable names are not plain words
+        template = NestedPromptTemplate(
+            name="Review",
+            pattern="As a [user role], review [file.name] for [issue: type]",
+            variables={}
+        )
+        
+        # When: Building with values for every variable
+        result = template.build_prompt({"user role": "reviewer", "file.name": "app.py",
+                                        "issue: type": "bugs"})
+        
+        # Then: Should fill every variable
+        assert result == "As a reviewer, review app.py for bugs"
+    
+    def test_build_prompt_fails_with_missing_variable(self):
+        """Test that building fails when a variable has no value"""
+        # Given: A template with two variables
+        template = NestedPromptTemplate(
+            name="User Story",
+            pattern="As a [role], I want to [what]",
+            variables={"role": ["developer"], "what": {"developer": ["write code"]}}
+        )
+        
+        # When/Then: Should raise ValueError
+        with pytest.raises(ValueError, match="Missing required variable"):
+            template.build_prompt({"role": "developer"})
+    
+    def test_build_prompt_without_variables_returns_pattern(self):
+        """Test that a pattern with no variables is returned as-is"""
+        # Given: A template with no variables in its pattern
+        template = NestedPromptTemplate(name="Plain", pattern="Summarize this.", variables={})
+        
+        # When/Then: Should return the pattern unchanged
+        assert template.build_prompt({}) == "Summarize this."
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
@@ -1,9 +1,22 @@
 # test_prompt_builder_dom.py
 # 🔴 RED: Failing test for DOM-based prompt builder
 
+import sys
 import pytest
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Fixed text the pieces emit - one shared object each
+_ROLE_PREFIX = sys.intern("You are ")
+_VOICE_SEPARATOR = sys.intern(". ")
+_CTX_LABEL = sys.intern("Context: ")
+_CTX_PREFIX = sys.intern("\n\nContext: ")
+_AUD_LABEL = sys.intern("Your audience: ")
+_AUD_PREFIX = sys.intern("\n\nYour audience: ")
+
+def _is_valid_text(text: str) -> bool:
+    """A piece's text is valid when it has something besides whitespace"""
+    return bool(text and text.strip())
 
 # ============================================================================
 # DOM Structure: Composite of Decorators with Template Methods
@@ -12,6 +25,8 @@ from typing import List, Dict, Any
 class PromptPiece(ABC):
     """Base class for all prompt pieces - Template Method Pattern"""
     
+    __slots__ = ()  # Lets the subclass slots replace the per-instance __dict__
+    
     @abstractmethod
     def render(self) -> str:
         """Template method - must be implemented by subclasses"""
@@ -21,10 +36,16 @@ class PromptPiece(ABC):
     def validate(self) -> bool:
         """Template method - must be implemented by subclasses"""
         pass
+    
+    def render_if_valid(self) -> Optional[str]:
+        """Render in the same pass as validation - None if the piece is invalid"""
+        return self.render() if self.validate() else None
 
 class PromptDecorator(PromptPiece):
     """Decorator base class - can wrap other pieces"""
     
+    __slots__ = ('component',)
+    
     def __init__(self, component: PromptPiece = None):
         self.component = component
     
@@ -43,6 +64,14 @@ class PromptDecorator(PromptPiece):
             return self._validate_decorator() and self.component.validate()
         return self._validate_decorator()
     
+    def render_if_valid(self) -> Optional[str]:
+        if not self._validate_decorator():
+            return None
+        inner = self.component.render_if_valid() if self.component else ""
+        if inner is None:
+            return None
+        return self._decorate(inner)
+    
     @abstractmethod
     def _validate_decorator(self) -> bool:
         """Template method for validation logic"""
@@ -51,6 +80,8 @@ class PromptDecorator(PromptPiece):
 class PromptComposite(PromptPiece):
     """Composite class - contains multiple pieces"""
     
+    __slots__ = ('pieces',)
+    
     def __init__(self):
         self.pieces: List[PromptPiece] = []
     
@@ -59,19 +90,13 @@ class PromptComposite(PromptPiece):
         self.pieces.append(piece)
     
     def render(self) -> str:
-        """Render all pieces in sequence"""
-        result = []
-        for piece in self.pieces:  # Polymorphic for-each loop
-            if piece.validate():
-                result.append(piece.render())
-        return "\n\n".join(result)
+        """Render all valid pieces in sequence"""
+        return "\n\n".join(r for piece in self.pieces  # Polymorphic for-each loop
+                           if (r := piece.render_if_valid()) is not None)
     
     def validate(self) -> bool:
         """Validate all pieces"""
-        for piece in self.pieces:  # Polymorphic for-each loop
-            if not piece.validate():
-                return False
-        return True
+        return all(piece.validate() for piece in self.pieces)  # Polymorphic, stops at first failure
 
 # ============================================================================
 # Concrete Implementations
@@ -80,59 +105,67 @@ class PromptComposite(PromptPiece):
 class RolePiece(PromptPiece):
     """Concrete role piece"""
     
+    __slots__ = ('role_text',)
+    
     def __init__(self, role_text: str):
         self.role_text = role_text
     
     def render(self) -> str:
-        return f"You are {self.role_text}"
+        return _ROLE_PREFIX + self.role_text
     
     def validate(self) -> bool:
-        return bool(self.role_text and len(self.role_text.strip()) > 0)
+        return _is_valid_text(self.role_text)
 
 class VoiceDecorator(PromptDecorator):
     """Decorator that adds voice/tone"""
     
+    __slots__ = ('voice_text',)
+    
     def __init__(self, voice_text: str, component: PromptPiece = None):
         super().__init__(component)
         self.voice_text = voice_text
     
     def _decorate(self, content: str) -> str:
         if content:
-            return f"{content}. {self.voice_text}"
+            return content + _VOICE_SEPARATOR + self.voice_text
         return self.voice_text
     
     def _validate_decorator(self) -> bool:
-        return bool(self.voice_text and len(self.voice_text.strip()) > 0)
+        return _is_valid_text(self.voice_text)
 
 class ContextDecorator(PromptDecorator):
     """Decorator that adds context"""
     
+    __slots__ = ('context_text',)
+    
     def __init__(self, context_text: str, component: PromptPiece = None):
         super().__init__(component)
         self.context_text = context_text
     
     def _decorate(self, content: str) -> str:
         if content:
-            return f"{content}\n\nContext: {self.context_text}"
-        return f"Context: {self.context_text}"
+            return content + _CTX_PREFIX + self.context_text
+        return _CTX_LABEL + self.context_text
     
     def _validate_decorator(self) -> bool:
-        return bool(self.context_text and len(self.context_text.strip()) > 0)
+        return _is_valid_text(self.context_text)
 
 class AudienceDecorator(PromptDecorator):
     """Decorator that adds audience specification"""
     
+    __slots__ = ('audience_text',)
+    
     def __init__(self, audience_text: str, component: PromptPiece = None):
         super().__init__(component)
         self.audience_text = audience_text
     
     def _decorate(self, content: str) -> str:
         if content:
-            return f"{content}\n\nYour audience: {self.audience_text}"
-        return f"Your audience: {self.audience_text}"
+            return content + _AUD_PREFIX + self.audience_text
+        return _AUD_LABEL + self.audience_text
     
     def _validate_decorator(self) -> bool:
-        return bool(self.audience_text and len(self.audience_text.strip()) > 0)
+        return _is_valid_text(self.audience_text)
 
 # ============================================================================
 # Tests
@@ -238,6 +271,106 @@ class TestPromptBuilderDOM:
         
         # When/Then: Should fail validation
         assert composite.validate() is False
+    
+    def test_composite_render_skips_invalid_pieces(self):
+        """Test composite rendering leaves out invalid pieces and invalid chains"""
+        # Given: A composite with a valid piece, an invalid piece and a chain over an invalid role
+        composite = PromptComposite()
+        composite.add_piece(RolePiece("a senior developer"))
+        composite.add_piece(VoiceDecorator(""))
+        composite.add_piece(VoiceDecorator("Be concise", RolePiece("")))
+        composite.add_piece(ContextDecorator("Reviewing a pull request"))
+        
+        # When: Rendering the composite
+        result = composite.render()
+        
+        # Then: Should only contain the valid pieces
+        assert result == "You are a senior developer\n\nContext: Reviewing a pull request"
+        assert VoiceDecorator("Be concise", RolePiece("")).render_if_valid() is None
+    
+    def test_composite_renders_pieces_appended_directly(self):
+        """Test pieces appended to the public pieces list are rendered too"""
+        # Given: A composite whose piece was appended without add_piece
+        composite = PromptComposite()
+        composite.pieces.append(RolePiece("x"))
+        
+        # When/Then: Should render and validate that piece
+        assert composite.render() == "You are x"
+        assert composite.validate() is True
+    
+    def test_render_follows_text_changes(self):
+        """Test text changes made after construction are picked up"""
+        # Given: A decorated role that has been rendered once
+        role = RolePiece("a senior developer")
+        voice = VoiceDecorator("Be concise", role)
+        
+        # When/Then: Should render the original text
+        assert voice.render() == "You are a senior developer. Be concise"
+        
+        # When: Changing the wrapped role's text
+        role.role_text = "a tester"
+        
+        # Then: Should render the new text
+        assert voice.render() == "You are a tester. Be concise"
+        
+        # When: Emptying the voice text
+        voice.voice_text = ""
+        
+        # Then: Should revalidate
+        assert voice.validate() is False
+    
+    def test_deep_chain_renders_same_text_as_nested_formatting(self):
+        """Test a full decorator chain renders exactly, with and without a wrapped role"""
+        # Given: A fully decorated role and a chain with no role
+        chain = AudienceDecorator("developers", ContextDecorator("code review",
+                                  VoiceDecorator("Be precise", RolePiece("a reviewer"))))
+        bare = AudienceDecorator("developers", ContextDecorator("code review"))
+        
+        # When/Then: Should render the same text the nested f-strings produced
+        assert chain.render() == ("You are a reviewer. Be precise\n\nContext: code review"
+                                  "\n\nYour audience: developers")
+        assert bare.render() == "Context: code review\n\nYour audience: developers"
+        assert chain.render_if_valid() == chain.render()
+    
+    def test_decorator_chain_follows_inner_changes(self):
+        """Test an outer decorator picks up changes made inside its chain"""
+        # Given: A role wrapped in three decorators
+        role = RolePiece("a reviewer")
+        voice = VoiceDecorator("Be precise", role)
+        context = ContextDecorator("code review", voice)
+        audience = AudienceDecorator("developers", context)
+        
+        # When: An inner decorator is given a different role
+        voice.component = RolePiece("a tester")
+        
+        # Then: The outer decorator should render the new role
+        assert audience.render().startswith("You are a tester. Be precise")
+        
+        # When: An inner decorator's text becomes invalid
+        voice.voice_text = ""
+        
+        # Then: The whole chain should be invalid
+        assert audience.validate() is False
+        assert audience.render_if_valid() is None
+    
+    def test_whitespace_only_text_is_invalid(self):
+        """Test pieces whose text is only whitespace fail validation"""
+        # Given: Pieces built from blank text
+        blanks = [RolePiece("   "), VoiceDecorator("\t"), AudienceDecorator("   ")]
+        
+        # When/Then: None should be valid
+        for piece in blanks:
+            assert piece.validate() is False
+    
+    def test_pieces_have_no_instance_dict(self):
+        """Test every piece type stores its attributes in slots"""
+        # Given: One of each kind of piece
+        pieces = [RolePiece("a developer"), VoiceDecorator("Be brief"), ContextDecorator("Review"),
+                  AudienceDecorator("Engineers"), PromptComposite()]
+        
+        # When/Then: None should carry a __dict__
+        for piece in pieces:
+            assert not hasattr(piece, "__dict__")
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 # test_template_approvals.py
 # 🟢 GREEN: Approvals tests for data-driven template aspects
 
+import itertools
 import pytest
 from approvaltests import verify
 from test_template_builder import PromptTemplate, TemplateBuilder
@@ -129,13 +130,13 @@ class TestTemplateApprovals:
         )
         
         # When: Generating all possible combinations
+        slot_order = ("role", "action", "reason")
+        slot_options = [tuple(template.get_options_for_slot(slot)) for slot in slot_order]
         combinations = []
-        for role in template.get_options_for_slot("role"):
-            for action in template.get_options_for_slot("action"):
-                for reason in template.get_options_for_slot("reason"):
-                    values = {"role": role, "action": action, "reason": reason}
-                    prompt = template.build_prompt(values)
-                    combinations.append(f"{role} + {action} + {reason} = {prompt}")
+        for role, action, reason in itertools.product(*slot_options):
+            values = {"role": role, "action": action, "reason": reason}
+            prompt = template.build_prompt(values)
+            combinations.append(f"{role} + {action} + {reason} = {prompt}")
         
         # Then: Verify all combinations (approval test)
         verify("\n".join(combinations))
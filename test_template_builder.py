@@ -1,20 +1,53 @@
 # test_template_builder.py
 # 🔴 RED: Failing test for minimal template functionality
 
+import string
 import pytest
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple
+
+_FORMATTER = string.Formatter()
 
 # ============================================================================
 # Minimal Template System
 # ============================================================================
 
+def _compile_pattern(pattern: str) -> Tuple[Optional[List[Tuple[bool, str]]], Tuple[str, ...]]:
+    """Split a pattern into (is_slot, text) segments plus its slot names in order
+    
+    Patterns using anything beyond plain {name} fields get no segments and are
+    left to str.format.
+    """
+    try:
+        parsed = list(_FORMATTER.parse(pattern))
+    except ValueError:
+        return None, ()
+    segments = []
+    for literal, field, format_spec, conversion in parsed:
+        if literal:
+            segments.append((False, literal))
+        if field is None:
+            continue
+        if not field.isidentifier() or format_spec or conversion:
+            return None, ()
+        segments.append((True, field))
+    return segments, tuple(dict.fromkeys(text for is_slot, text in segments if is_slot))
+
 class PromptTemplate:
     """A simple template with slots that can be filled"""
     
+    __slots__ = ('name', 'pattern', 'slots', '_segments', '_slot_order', '_slot_names')
+    
     def __init__(self, name: str, pattern: str, slots: Dict[str, List[str]]):
         self.name = name
         self.pattern = pattern  # "As a {role}, I want to create better code."
         self.slots = slots      # {"role": ["developer", "designer", "manager"]}
+        self._segments, self._slot_order = _compile_pattern(pattern)
+        self._slot_names = frozenset(self._slot_order)
+    
+    def asdict(self) -> Dict[str, object]:
+        """Get the template as a plain dict for JSON responses"""
+        return {"name": self.name, "pattern": self.pattern, "slots": self.slots}
     
     def get_available_slots(self) -> List[str]:
         """Get list of slot names that can be filled"""
@@ -24,10 +57,27 @@ class PromptTemplate:
         """Get available options for a specific slot"""
         return self.slots.get(slot_name, [])
     
+    def get_slot_options(self) -> Mapping[str, List[str]]:
+        """Get the options for every slot, keyed by slot name (read-only view, not a copy)"""
+        return MappingProxyType(self.slots)
+    
     def build_prompt(self, values: Dict[str, str]) -> str:
         """Build the prompt by filling in the slots"""
         try:
-            return self.pattern.format(**values)
+            if self._segments is None:
+                return self.pattern.format_map(values)
+            # Report a missing slot before filling anything in
+            missing = self._slot_names.difference(values) if self._slot_names else None
+            if missing:
+                raise KeyError(next(name for name in self._slot_order if name in missing))
+            parts = []
+            for is_slot, text in self._segments:
+                if is_slot:
+                    value = values[text]
+                    parts.append(value if type(value) is str else format(value))
+                else:
+                    parts.append(text)
+            return "".join(parts)
         except KeyError as e:
             raise ValueError(f"Missing required slot: {e}")
         except Exception as e:
@@ -37,38 +87,59 @@ class TemplateBuilder:
     """Simple builder for creating prompts from templates"""
     
     def __init__(self):
-        self.templates: List[PromptTemplate] = []
+        self._by_name: Dict[str, PromptTemplate] = {}  # Kept in the order added
+    
+    @property
+    def templates(self) -> List[PromptTemplate]:
+        """Get the templates in the order they were added"""
+        return list(self._by_name.values())
     
     def add_template(self, template: PromptTemplate):
-        """Add a template to the builder"""
-        self.templates.append(template)
+        """Add a template to the builder; template names must be unique"""
+        if template.name in self._by_name:
+            raise ValueError(f"Template already exists: {template.name}")
+        self._by_name[template.name] = template
     
     def get_template_names(self) -> List[str]:
         """Get list of available template names"""
-        return [template.name for template in self.templates]
+        return list(self._by_name)
     
     def get_template_by_name(self, name: str) -> Optional[PromptTemplate]:
         """Get a template by name"""
-        for template in self.templates:
-            if template.name == name:
-                return template
-        return None
+        return self._by_name.get(name)
 
 # ============================================================================
 # Tests
 # ============================================================================
 
+# Templates are never modified by the tests, so each is built once per module
+@pytest.fixture(scope="module")
+def user_story_template():
+    return PromptTemplate(
+        name="User Story",
+        pattern="As a {role}, I want to create better code.",
+        slots={"role": ["developer", "designer", "manager"]}
+    )
+
+@pytest.fixture(scope="module")
+def enhanced_user_story_template():
+    return PromptTemplate(
+        name="Enhanced User Story",
+        pattern="As a {role}, I want to {action} so that {reason}.",
+        slots={
+            "role": ["developer", "designer", "manager"],
+            "action": ["create", "improve", "fix", "optimize"],
+            "reason": ["users benefit", "system works better", "team is efficient"]
+        }
+    )
+
 class TestTemplateBuilder:
     """Test the minimal template builder"""
     
-    def test_can_create_simple_template(self):
+    def test_can_create_simple_template(self, user_story_template):
         """Test creating a basic template with one slot"""
         # Given: A simple template
-        template = PromptTemplate(
-            name="User Story",
-            pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
-        )
+        template = user_story_template
         
         # When: Getting available slots
         slots = template.get_available_slots()
@@ -77,14 +148,10 @@ class TestTemplateBuilder:
         assert slots == ["role"]
         assert template.name == "User Story"
     
-    def test_can_get_options_for_slot(self):
+    def test_can_get_options_for_slot(self, user_story_template):
         """Test getting options for a specific slot"""
         # Given: A template with role slot
-        template = PromptTemplate(
-            name="User Story",
-            pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
-        )
+        template = user_story_template
         
         # When: Getting options for role slot
         options = template.get_options_for_slot("role")
@@ -92,14 +159,24 @@ class TestTemplateBuilder:
         # Then: Should return the role options
         assert options == ["developer", "designer", "manager"]
     
-    def test_can_build_prompt_with_valid_values(self):
+    def test_can_get_options_for_every_slot(self, enhanced_user_story_template):
+        """Test getting the options for all slots at once"""
+        # When: Getting every slot's options
+        options = enhanced_user_story_template.get_slot_options()
+
+        # Then: Should hold the same options as asking slot by slot
+        assert list(options) == ["role", "action", "reason"]
+        for slot_name in enhanced_user_story_template.get_available_slots():
+            assert options[slot_name] == enhanced_user_story_template.get_options_for_slot(slot_name)
+        
+        # And: Should not let callers replace a slot's options
+        with pytest.raises(TypeError):
+            options["role"] = []
+
+    def test_can_build_prompt_with_valid_values(self, user_story_template):
         """Test building a prompt with valid slot values"""
         # Given: A template and valid values
-        template = PromptTemplate(
-            name="User Story",
-            pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
-        )
+        template = user_story_template
         values = {"role": "developer"}
         
         # When: Building the prompt
@@ -108,29 +185,94 @@ class TestTemplateBuilder:
         # Then: Should build correctly
         assert result == "As a developer, I want to create better code."
     
-    def test_build_prompt_fails_with_missing_slot(self):
+    def test_build_prompt_fails_with_missing_slot(self, user_story_template):
         """Test that building fails when required slot is missing"""
         # Given: A template and missing values
-        template = PromptTemplate(
-            name="User Story",
-            pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
-        )
+        template = user_story_template
         values = {}  # Missing role
         
         # When/Then: Should raise ValueError
         with pytest.raises(ValueError, match="Missing required slot"):
             template.build_prompt(values)
     
-    def test_can_add_template_to_builder(self):
-        """Test adding a template to the builder"""
-        # Given: A template builder and template
-        builder = TemplateBuilder()
+    def test_build_prompt_reports_first_missing_slot(self):
+        """Test that the first missing slot in the pattern is the one reported"""
+        # Given: A template with several slots
+        template = PromptTemplate(
+            name="Enhanced User Story",
+            pattern="As a {role}, I want to {action} so that {reason}.",
+            slots={"role": ["developer"], "action": ["create"], "reason": ["users benefit"]}
+        )
+        
+        # When/Then: Should name the first slot without a value
+        with pytest.raises(ValueError, match="Missing required slot: 'action'"):
+            template.build_prompt({"role": "developer"})
+    
+    def test_build_prompt_ignores_extra_values(self):
+        """Test that values for slots not in the pattern are ignored"""
+        # Given: A template whose pattern uses one of its slots
         template = PromptTemplate(
             name="User Story",
             pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
+            slots={"role": ["developer"], "unused": ["anything"]}
+        )
+        
+        # When: Building with an extra value
+        result = template.build_prompt({"role": "developer", "template_name": "User Story"})
+        
+        # Then: Should build from the pattern's slot only
+        assert result == "As a developer, I want to create better code."
+    
+    def test_build_prompt_matches_str_format(self):
+        """Test that building gives the same text str.format would"""
+        # Given: Patterns with repeated slots, escaped braces and a format spec
+        patterns = [
+            "As a {role}, I want to {action}.",
+            "{role} and {role} {{literal}}",
+            "Score: {score:>5}",
+            "No slots at all",
+        ]
+        values = {"role": "developer", "action": "create", "score": 7}
+        
+        # When/Then: Each pattern should build exactly like str.format
+        for pattern in patterns:
+            template = PromptTemplate(name="T", pattern=pattern, slots={})
+            assert template.build_prompt(values) == pattern.format(**values)
+    
+    def test_build_prompt_accepts_read_only_mapping(self):
+        """Test building from a mapping that is not a dict"""
+        # Given: A template and read-only values
+        template = PromptTemplate(
+            name="User Story",
+            pattern="As a {role}, I want to {action}.",
+            slots={"role": ["developer"], "action": ["create"]}
         )
+        values = MappingProxyType({"role": "developer", "action": "create"})
+        
+        # When: Building the prompt
+        result = template.build_prompt(values)
+        
+        # Then: Should read the values without copying them into a dict
+        assert result == "As a developer, I want to create."
+    
+    def test_template_as_dict_has_no_instance_dict(self, user_story_template):
+        """Test converting a template to a dict and that it stores attributes in slots"""
+        # When: Converting the template
+        data = user_story_template.asdict()
+        
+        # Then: Should carry the public fields only
+        assert data == {
+            "name": "User Story",
+            "pattern": "As a {role}, I want to create better code.",
+            "slots": {"role": ["developer", "designer", "manager"]}
+        }
+        assert not hasattr(user_story_template, "__dict__")
+    
+    def test_can_add_template_to_builder(self, user_story_template):
+        """Test adding a template to the builder"""
+        # Given: A template builder and template
+        builder = TemplateBuilder()
+        template = user_story_template
         
         # When: Adding template to builder
         builder.add_template(template)
@@ -138,15 +280,11 @@ class TestTemplateBuilder:
         # Then: Should be available
         assert "User Story" in builder.get_template_names()
     
-    def test_can_get_template_by_name(self):
+    def test_can_get_template_by_name(self, user_story_template):
         """Test retrieving a template by name"""
         # Given: A builder with a template
         builder = TemplateBuilder()
-        template = PromptTemplate(
-            name="User Story",
-            pattern="As a {role}, I want to create better code.",
-            slots={"role": ["developer", "designer", "manager"]}
-        )
+        template = user_story_template
         builder.add_template(template)
         
         # When: Getting template by name
@@ -168,22 +306,29 @@ class TestTemplateBuilder:
         # Then: Should return None
         assert result is None
 
+    def test_add_template_rejects_duplicate_names(self):
+        """Test that a second template with a taken name is refused"""
+        # Given: A builder holding a template
+        builder = TemplateBuilder()
+        first = PromptTemplate(name="User Story", pattern="As a {role}.", slots={"role": ["developer"]})
+        builder.add_template(first)
+        
+        # When/Then: Adding another template with the same name should fail
+        with pytest.raises(ValueError, match="Template already exists: User Story"):
+            builder.add_template(PromptTemplate(name="User Story", pattern="I am a {role}.", slots={"role": ["designer"]}))
+        
+        # And: The first template should be kept
+        assert builder.get_template_by_name("User Story") is first
+        assert builder.templates == [first]
+
     # ============================================================================
     # 🔴 RED: New failing test for multiple slots
     # ============================================================================
     
-    def test_can_create_template_with_multiple_slots(self):
+    def test_can_create_template_with_multiple_slots(self, enhanced_user_story_template):
         """Test creating a template with multiple slots"""
         # Given: A template with multiple slots
-        template = PromptTemplate(
-            name="Enhanced User Story",
-            pattern="As a {role}, I want to {action} so that {reason}.",
-            slots={
-                "role": ["developer", "designer", "manager"],
-                "action": ["create", "improve", "fix", "optimize"],
-                "reason": ["users benefit", "system works better", "team is efficient"]
-            }
-        )
+        template = enhanced_user_story_template
         
         # When: Getting available slots
         slots = template.get_available_slots()
@@ -194,18 +339,10 @@ class TestTemplateBuilder:
         assert "action" in slots
         assert "reason" in slots
     
-    def test_can_build_prompt_with_multiple_slots(self):
+    def test_can_build_prompt_with_multiple_slots(self, enhanced_user_story_template):
         """Test building a prompt with multiple slot values"""
         # Given: A template with multiple slots and valid values
-        template = PromptTemplate(
-            name="Enhanced User Story",
-            pattern="As a {role}, I want to {action} so that {reason}.",
-            slots={
-                "role": ["developer", "designer", "manager"],
-                "action": ["create", "improve", "fix", "optimize"],
-                "reason": ["users benefit", "system works better", "team is efficient"]
-            }
-        )
+        template = enhanced_user_story_template
         values = {
             "role": "developer",
             "action": "create",
@@ -219,18 +356,10 @@ class TestTemplateBuilder:
         expected = "As a developer, I want to create so that users benefit."
         assert result == expected
     
-    def test_build_prompt_fails_with_partial_slots(self):
+    def test_build_prompt_fails_with_partial_slots(self, enhanced_user_story_template):
         """Test that building fails when some required slots are missing"""
         # Given: A template with multiple slots and partial values
-        template = PromptTemplate(
-            name="Enhanced User Story",
-            pattern="As a {role}, I want to {action} so that {reason}.",
-            slots={
-                "role": ["developer", "designer", "manager"],
-                "action": ["create", "improve", "fix", "optimize"],
-                "reason": ["users benefit", "system works better", "team is efficient"]
-            }
-        )
+        template = enhanced_user_story_template
         values = {
             "role": "developer",
             "action": "create"
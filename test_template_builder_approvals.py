@@ -8,8 +8,89 @@ reducing redundancy in testing API responses and UI interactions.
 import pytest
 import json
 import os
+import re
+from itertools import chain
+from functools import lru_cache
 from unittest.mock import patch, MagicMock
 
+_VAR_RE = re.compile(r'\[([^\]]+)\]')
+
+# json.dumps(indent=2) builds a new encoder on every call; share one instead
+_JSON_ENCODER = json.JSONEncoder(indent=2)
+
+
+@lru_cache(maxsize=256)
+def _extract_variables(template):
+    """Variable names in a template's [brackets], in order"""
+    if '[' not in template:
+        return ()  # Plain prompts skip the regex engine entirely
+    return tuple(_VAR_RE.findall(template))
+
+
+_DEFAULT_OPTIONS = {
+    'role': ['Programmer', 'Chef', 'Soccer Coach', 'Teacher', 'Designer'],
+    'what': ['Write code', 'Shop for food', 'Create tests', 'Prepare lunch', 'Plan dinner party', 'Refactor'],
+    'why': ['Build better software', 'Cook delicious meals', 'Improve code quality', 'Feed my family', 'Host friends'],
+    'action': ['Write code', 'Create tests', 'Refactor', 'Shop for food', 'Prepare lunch'],
+    'context': ['Web development', 'Mobile app', 'Backend API', 'Kitchen', 'Restaurant'],
+    'component': ['API endpoint', 'Database', 'Frontend', 'Backend', 'UI component'],
+    'reviewer': ['Senior Developer', 'Junior Developer', 'Architect', 'QA Engineer'],
+    'target': ['bug', 'feature', 'performance', 'security issue'],
+    'reason': ['it\'s causing crashes', 'users need it', 'it\'s too slow', 'it\'s insecure'],
+    'subject': ['user', 'system', 'component', 'feature'],
+    'behavior': ['respond', 'update', 'display', 'process'],
+    'condition': ['user clicks', 'data changes', 'time expires', 'error occurs']
+}
+
+_CONTEXT_OPTIONS = {
+    'what': {
+        'Programmer': ['Write code', 'Create tests', 'Refactor', 'Debug', 'Optimize'],
+        'Chef': ['Shop for food', 'Prepare lunch', 'Plan dinner party', 'Cook meal', 'Bake dessert'],
+        'Soccer Coach': ['Train players', 'Plan strategy', 'Analyze games', 'Motivate team', 'Teach skills']
+    },
+    'why': {
+        'Write code': ['Build better software', 'Solve problems', 'Learn new skills', 'Improve efficiency'],
+        'Shop for food': ['Cook delicious meals', 'Feed my family', 'Save money', 'Eat healthy'],
+        'Create tests': ['Ensure quality', 'Prevent bugs', 'Build confidence', 'Document behavior']
+    }
+}
+
+# Each variable's context keys mapped to (priority, options) - the earliest listed key wins
+_CONTEXT_INDEX = {
+    variable: {key: (rank, options) for rank, (key, options) in enumerate(by_key.items())}
+    for variable, by_key in _CONTEXT_OPTIONS.items()
+}
+
+_FALLBACK_CONTEXT_OPTIONS = {
+    'what': ['Write code', 'Shop for food', 'Create tests', 'Prepare lunch'],
+    'why': ['Build better software', 'Cook delicious meals', 'Improve quality', 'Feed my family']
+}
+
+
+# The memoized helpers return shared objects - callers must not modify them
+@lru_cache(maxsize=128)
+def _generate_dropdowns(template):
+    """Dropdown options for each variable in a template"""
+    dropdowns = {}
+    for var in _extract_variables(template):
+        options = _DEFAULT_OPTIONS.get(var)
+        if options is None:
+            options = [f'Option 1 for {var}', f'Option 2 for {var}']
+        dropdowns[var] = {'options': options}
+    return dropdowns
+
+
+@lru_cache(maxsize=128)
+def _get_context_options(variable, context_items):
+    """Options for a variable given the (name, value) pairs already selected"""
+    index = _CONTEXT_INDEX.get(variable)
+    if index:
+        matches = [index[value] for _, value in context_items if value in index]
+        if matches:
+            return min(matches)[1]
+    options = _FALLBACK_CONTEXT_OPTIONS.get(variable)
+    return options if options is not None else [f'Option for {variable}']
+
 
 class TestTemplateBuilderApprovals:
     """Approval tests for Template Builder API and UI functionality."""
@@ -28,15 +109,14 @@ class TestTemplateBuilderApprovals:
         ]
         
         # When: Parsing each template
-        parsing_results = []
-        for template in test_templates:
-            variables = self._extract_variables(template)
-            parsing_results.append(f"Template: {template}")
-            parsing_results.append(f"Variables: {variables}")
-            parsing_results.append("---")
+        output = "\n".join(chain.from_iterable(
+            ("Template: " + template,
+             "Variables: " + str(self._extract_variables(template)),
+             "---")
+            for template in test_templates
+        ))
         
         # Then: Save results for approval
-        output = "\n".join(parsing_results)
         self._save_approval_output("template_parsing_responses", output)
         
         # Verify the output is as expected
@@ -65,15 +145,14 @@ class TestTemplateBuilderApprovals:
         ]
         
         # When: Generating dropdowns for each template
-        dropdown_results = []
-        for template in test_templates:
-            dropdowns = self._generate_dropdowns(template)
-            dropdown_results.append(f"Template: {template}")
-            dropdown_results.append(f"Dropdowns: {json.dumps(dropdowns, indent=2)}")
-            dropdown_results.append("---")
+        output = "\n".join(chain.from_iterable(
+            ("Template: " + template,
+             "Dropdowns: " + _JSON_ENCODER.encode(self._generate_dropdowns(template)),
+             "---")
+            for template in test_templates
+        ))
         
         # Then: Save results for approval
-        output = "\n".join(dropdown_results)
         self._save_approval_output("dropdown_generation_responses", output)
         
         # Verify dropdowns are generated correctly
@@ -228,14 +307,14 @@ class TestTemplateBuilderApprovals:
         ]
         
         # When: Executing the workflow
-        workflow_results = []
-        for step in workflow_steps:
-            workflow_results.append(f"Step: {step['step']}")
-            workflow_results.append(f"Data: {json.dumps(step['data'], indent=2)}")
-            workflow_results.append("---")
+        output = "\n".join(chain.from_iterable(
+            (f"Step: {step['step']}",
+             f"Data: {_JSON_ENCODER.encode(step['data'])}",
+             "---")
+            for step in workflow_steps
+        ))
         
         # Then: Save results for approval
-        output = "\n".join(workflow_results)
         self._save_approval_output("complete_template_builder_workflow", output)
         
         # Verify workflow steps are logical
@@ -253,67 +332,20 @@ class TestTemplateBuilderApprovals:
     # Helper methods to simulate the actual functionality
     def _extract_variables(self, template):
         """Extract variables from template text (simulating the actual implementation)"""
-        import re
-        return re.findall(r'\[([^\]]+)\]', template)
+        return list(_extract_variables(template))
     
     def _generate_dropdowns(self, template):
         """Generate dropdown options for template variables"""
-        variables = self._extract_variables(template)
-        default_options = {
-            'role': ['Programmer', 'Chef', 'Soccer Coach', 'Teacher', 'Designer'],
-            'what': ['Write code', 'Shop for food', 'Create tests', 'Prepare lunch', 'Plan dinner party', 'Refactor'],
-            'why': ['Build better software', 'Cook delicious meals', 'Improve code quality', 'Feed my family', 'Host friends'],
-            'action': ['Write code', 'Create tests', 'Refactor', 'Shop for food', 'Prepare lunch'],
-            'context': ['Web development', 'Mobile app', 'Backend API', 'Kitchen', 'Restaurant'],
-            'component': ['API endpoint', 'Database', 'Frontend', 'Backend', 'UI component'],
-            'reviewer': ['Senior Developer', 'Junior Developer', 'Architect', 'QA Engineer'],
-            'target': ['bug', 'feature', 'performance', 'security issue'],
-            'reason': ['it\'s causing crashes', 'users need it', 'it\'s too slow', 'it\'s insecure'],
-            'subject': ['user', 'system', 'component', 'feature'],
-            'behavior': ['respond', 'update', 'display', 'process'],
-            'condition': ['user clicks', 'data changes', 'time expires', 'error occurs']
-        }
-        
-        dropdowns = {}
-        for var in variables:
-            dropdowns[var] = {
-                'options': default_options.get(var, [f'Option 1 for {var}', f'Option 2 for {var}'])
-            }
-        return dropdowns
+        return _generate_dropdowns(template)
     
     def _get_context_options(self, variable, context):
         """Get context-aware options for a variable"""
-        context_options = {
-            'what': {
-                'Programmer': ['Write code', 'Create tests', 'Refactor', 'Debug', 'Optimize'],
-                'Chef': ['Shop for food', 'Prepare lunch', 'Plan dinner party', 'Cook meal', 'Bake dessert'],
-                'Soccer Coach': ['Train players', 'Plan strategy', 'Analyze games', 'Motivate team', 'Teach skills']
-            },
-            'why': {
-                'Write code': ['Build better software', 'Solve problems', 'Learn new skills', 'Improve efficiency'],
-                'Shop for food': ['Cook delicious meals', 'Feed my family', 'Save money', 'Eat healthy'],
-                'Create tests': ['Ensure quality', 'Prevent bugs', 'Build confidence', 'Document behavior']
-            }
-        }
-        
-        if variable in context_options:
-            for context_key, options in context_options[variable].items():
-                if context_key in context.values():
-                    return options
-        
-        # Fallback options
-        default_options = {
-            'what': ['Write code', 'Shop for food', 'Create tests', 'Prepare lunch'],
-            'why': ['Build better software', 'Cook delicious meals', 'Improve quality', 'Feed my family']
-        }
-        return default_options.get(variable, [f'Option for {variable}'])
+        return _get_context_options(variable, frozenset(context.items()))
     
     def _generate_final_prompt(self, template, selections):
         """Generate final prompt by replacing variables with selections"""
-        final_prompt = template
-        for variable, value in selections.items():
-            final_prompt = final_prompt.replace(f'[{variable}]', value)
-        return final_prompt
+        # One pass over the template; variables without a selection are left as-is
+        return _VAR_RE.sub(lambda match: selections.get(match.group(1), match.group(0)), template)
 
 
 if __name__ == "__main__":
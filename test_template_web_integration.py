@@ -41,13 +41,7 @@ class TestTemplateWebIntegration:
         builder.add_template(code_review)
         
         # When: Getting template data for web interface
-        template_data = []
-        for template in builder.templates:
-            template_data.append({
-                "name": template.name,
-                "pattern": template.pattern,
-                "slots": template.slots
-            })
+        template_data = [template.asdict() for template in builder.templates]
         
         # Then: Should have formatted data for web
         assert len(template_data) == 2
@@ -136,9 +130,7 @@ class TestTemplateWebIntegration:
         )
         
         # When: Getting options for web dropdowns
-        web_options = {}
-        for slot_name in template.get_available_slots():
-            web_options[slot_name] = template.get_options_for_slot(slot_name)
+        web_options = template.get_slot_options()
         
         # Then: Should have options for each slot
         assert "role" in web_options
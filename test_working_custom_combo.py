@@ -1,13 +1,29 @@
 #!/usr/bin/env python3
 """
 Test the working custom combo box functionality.
+
+Manual runner against a live server; tests/test_combo_page.py covers the
+same markers under pytest.
 """
 
 import requests
-import json
 
-def test_working_custom_combo():
-    """Test the working custom combo box functionality."""
+from combo_page_markers import (
+    EVENT_LISTENER_MARKERS, FUNCTION_MARKERS, MODE_MARKERS, PAGE_MARKERS, UI_MARKERS,
+)
+
+
+def report_markers(content, markers):
+    """Print whether each marker appears in the page content."""
+    for marker in markers:
+        if marker in content:
+            print(f"   ✅ Found: {marker}")
+        else:
+            print(f"   ❌ Missing: {marker}")
+
+
+def check_working_custom_combo():
+    """Check the working custom combo box functionality against a running server."""
     base_url = "http://localhost:8000"
     
     print("🧪 Testing Working Custom Combo Box Functionality")
@@ -15,67 +31,28 @@ def test_working_custom_combo():
     
     # Test 1: Check if test page loads correctly
     print("1. Testing page load...")
-    response = requests.get(f"{base_url}/combo-test")
+    with requests.Session() as session:
+        response = session.get(f"{base_url}/combo-test")
     if response.status_code == 200:
         print("   ✅ Test page loads successfully")
         content = response.text
         
-        # Check for key elements
-        if "Custom Combo Box Test" in content:
-            print("   ✅ Page title found")
-        if "Generate Test Combo Boxes" in content:
-            print("   ✅ Generate button found")
-        if "Mode: DISPLAY" in content:
-            print("   ✅ Mode toggle button found")
-        if "<!DOCTYPE html>" in content:
-            print("   ✅ Proper HTML structure (not Jinja2 template)")
+        report_markers(content, PAGE_MARKERS)
     else:
         print(f"   ❌ Test page failed to load: {response.status_code}")
         return
     
     print("\n2. Testing JavaScript functions...")
     
-    # Check for custom combo box behavior functions
-    if "handleEnterKey" in content:
-        print("   ✅ Enter key handling function found")
-    if "addOrUpdateItem" in content:
-        print("   ✅ Add/update item function found")
-    if "deleteSelectedItem" in content:
-        print("   ✅ Delete item function found")
-    if "showDropdown" in content and "hideDropdown" in content:
-        print("   ✅ Dropdown show/hide functions found")
-    if "selectItem" in content:
-        print("   ✅ Select item function found")
-    if "toggleMode" in content:
-        print("   ✅ Mode toggle function found")
-    if "generateTestComboBoxes" in content:
-        print("   ✅ Generate combo boxes function found")
+    report_markers(content, FUNCTION_MARKERS)
     
     print("\n3. Testing event listeners...")
     
-    # Check for event listeners
-    if "addEventListener('keydown'" in content:
-        print("   ✅ Keydown event listener found")
-    if "addEventListener('focus'" in content:
-        print("   ✅ Focus event listener found")
-    if "addEventListener('blur'" in content:
-        print("   ✅ Blur event listener found")
-    if "addEventListener('input'" in content:
-        print("   ✅ Input event listener found")
-    if "addEventListener('click'" in content:
-        print("   ✅ Click event listeners found")
+    report_markers(content, EVENT_LISTENER_MARKERS)
     
     print("\n4. Testing mode-specific behavior...")
     
-    # Check for mode-specific behavior
-    if "getModeOptions" in content:
-        print("   ✅ Mode options function found")
-    if "getModePlaceholder" in content:
-        print("   ✅ Mode placeholder function found")
-    if "Add item" in content and "Select item" in content:
-        print("   ✅ Mode-specific first items found")
-    if "Enter ${tag}" in content and "Select ${tag}" in content:
-        print("   ✅ Mode-specific placeholders found")
+    report_markers(content, MODE_MARKERS)
     
     print("\n5. Testing UI components...")
     
@@ -84,12 +61,7 @@ def test_working_custom_combo():
         print("   ✅ Bootstrap CSS found")
     if "font-awesome" in content.lower() or "fas fa-" in content:
         print("   ✅ Font Awesome icons found")
-    if "btn btn-" in content:
-        print("   ✅ Bootstrap buttons found")
-    if "form-control" in content:
-        print("   ✅ Bootstrap form controls found")
-    if "dropdown-menu" in content:
-        print("   ✅ Bootstrap dropdowns found")
+    report_markers(content, UI_MARKERS)
     
     print("\n🎯 Summary:")
     print("   - Test page loads correctly with proper HTML ✅")
@@ -136,4 +108,4 @@ def test_working_custom_combo():
     print("   - Smooth user experience")
 
 if __name__ == "__main__":
-    test_working_custom_combo()
+    check_working_custom_combo()
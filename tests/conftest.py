@@ -1,76 +1,84 @@
 import sys
 import os
 import pytest
-import tempfile
-import json
-from approvaltests.reporters.generic_diff_reporter_factory import GenericDiffReporterFactory
-from approvaltests.reporters import Reporter
+import shutil
+from unittest.mock import Mock
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from prompt_manager.api import PromptManagerAPI
+from prompt_manager.storage import InMemoryStorage
 
-# Configure approval tests reporter
-@pytest.fixture(scope="session", autouse=True)
-def configure_approval_tests():
-    """Configure approval tests to use a simple reporter for CI/CD compatibility."""
-    from approvaltests import Options
-    from approvaltests.reporters import ReporterThatAutomaticallyApproves
-    
-    # Use auto-approve reporter for headless environments
-    Options.default_reporter = ReporterThatAutomaticallyApproves()
+# Contents of an empty template storage file
+_EMPTY_TEMPLATES = b'{}'
+
+@pytest.fixture(scope="session")
+def _empty_templates_file(tmp_path_factory):
+    """Write the empty template storage file once per session."""
+    templates_file = tmp_path_factory.mktemp("empty_storage") / "templates.json"
+    templates_file.write_bytes(_EMPTY_TEMPLATES)
+    return templates_file
+
+@pytest.fixture(scope="session")
+def prompt_api():
+    """One PromptManagerAPI for the session, keeping its prompts in memory."""
+    api = PromptManagerAPI(storage=InMemoryStorage())
+    api.app.config['TESTING'] = True
+    return api
+
+@pytest.fixture(scope="session")
+def _prompt_client(prompt_api):
+    """One test client for the shared API, reused by every test (the API sets no cookies)."""
+    return prompt_api.app.test_client()
 
 @pytest.fixture
-def client():
-    # Create a temporary file with valid empty JSON structure
-    with tempfile.NamedTemporaryFile(suffix='.json', delete=False, mode='w') as tmp:
-        json.dump({"prompts": {}}, tmp)
-        temp_storage = tmp.name
-    
-    try:
-        api = PromptManagerAPI(temp_storage)
-        app = api.app
-        app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_storage)
-        except:
-            pass
+def client(prompt_api, _prompt_client):
+    # Start every test from empty prompt storage instead of rebuilding the app
+    prompt_api.manager.prompts.clear()
+    prompt_api.manager.save_prompts()
+    return _prompt_client
 
 @pytest.fixture
-def template_client():
+def template_client(_empty_templates_file, tmp_path):
     """Client fixture for template tests that uses a clean templates.json file."""
-    # Create a temporary templates.json file
-    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
-        temp_templates = tmp.name
+    # Copy the clean templates.json so each test writes to its own file
+    temp_templates = tmp_path / "templates.json"
+    shutil.copyfile(_empty_templates_file, temp_templates)
+    
+    api = PromptManagerAPI(templates_storage=str(temp_templates), storage=InMemoryStorage())
+    app = api.app
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def dashboard_app():
+    """One Flask app with the chat dashboard blueprint, shared by the whole session."""
+    from flask import Flask
+    from routes.dashboard import dashboard_bp
     
-    try:
-        # Create a clean templates.json file
-        with open(temp_templates, 'w') as f:
-            json.dump({}, f)
-        
-        # Monkey patch the template service to use our temporary file
-        import src.prompt_manager.template_service as ts_module
-        original_init = ts_module.TemplateService.__init__
-        
-        def mock_init(self, storage_file='templates.json'):
-            original_init(self, temp_templates)
-        
-        ts_module.TemplateService.__init__ = mock_init
-        
-        api = PromptManagerAPI()
-        app = api.app
-        app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    finally:
-        # Restore original init
-        ts_module.TemplateService.__init__ = original_init
-        # Clean up temporary file
-        try:
-            os.unlink(temp_templates)
-        except:
-            pass
\ No newline at end of file
+    app = Flask(__name__,
+               template_folder='src/prompt_manager/templates')
+    app.config['TESTING'] = True
+    app.register_blueprint(dashboard_bp)
+    return app
+
+@pytest.fixture
+def dashboard_client(dashboard_app):
+    """Create test client for the shared dashboard app."""
+    return dashboard_app.test_client()
+
+@pytest.fixture
+def mock_provider_manager(monkeypatch):
+    """Swap the dashboard's provider manager for a mock whose get_provider returns a mock provider."""
+    provider = Mock()
+    provider.generate.return_value = "Response"
+    manager = Mock()
+    manager.get_provider.return_value = provider
+    monkeypatch.setattr('routes.dashboard.provider_manager', manager)
+    return manager
+
+@pytest.fixture
+def mock_provider(mock_provider_manager):
+    """The mock provider the patched dashboard hands out; generate() returns "Response"."""
+    return mock_provider_manager.get_provider.return_value
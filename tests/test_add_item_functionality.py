@@ -5,80 +5,68 @@ Tests the specific "Add item..." functionality in custom combo boxes.
 """
 
 import pytest
-import json
-from src.prompt_manager.web.app import create_app
+
+
+TEMPLATE = "As a [Role], I want to [What], so that [Why]"
+
+
+@pytest.fixture(scope="module")
+def web_client():
+    """One test client for the module; these tests only read from the app."""
+    # Imported here so collecting this module doesn't load the web app
+    from src.prompt_manager.web.app import create_app
+    return create_app().test_client()
+
+
+def _generate(client, edit_mode):
+    """POST the template to /template/generate in the given mode."""
+    return client.post('/template/generate', 
+                       json={
+                           'template': TEMPLATE,
+                           'edit_mode': edit_mode
+                       })
+
+
+@pytest.fixture(scope="module")
+def edit_response(web_client):
+    """Generate response for the template in edit mode, shared by the module."""
+    return _generate(web_client, True)
+
+
+@pytest.fixture(scope="module")
+def regular_response(web_client):
+    """Generate response for the template in regular mode, shared by the module."""
+    return _generate(web_client, False)
 
 
 class TestAddItemFunctionality:
     """Test add item functionality in custom combo boxes."""
     
-    def setup_method(self):
-        """Setup test environment."""
-        self.app = create_app()
-        self.client = self.app.test_client()
-        self.template = "As a [Role], I want to [What], so that [Why]"
-    
-    def test_edit_mode_first_option_is_add_item(self):
-        """Test that edit mode has 'Add item...' as the first option."""
-        response = self.client.post('/template/generate', 
-                                  json={
-                                      'template': self.template,
-                                      'edit_mode': True
-                                  },
-                                  content_type='application/json')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        # Should have 'Add item...' as first option
-        options = data['dropdowns']['Role']['options']
-        assert len(options) > 0
-        assert options[0] == 'Add item...'
-    
-    def test_regular_mode_no_add_item_option(self):
-        """Test that regular mode does not have 'Add item...' option."""
-        response = self.client.post('/template/generate', 
-                                  json={
-                                      'template': self.template,
-                                      'edit_mode': False
-                                  },
-                                  content_type='application/json')
-        
+    @pytest.mark.parametrize("response_fixture, add_item_first", [
+        ("edit_response", True),
+        ("regular_response", False),
+    ])
+    def test_add_item_option_only_in_edit_mode(self, request, response_fixture, add_item_first):
+        """Test that only edit mode has 'Add item...', as the first option."""
+        response = request.getfixturevalue(response_fixture)
         assert response.status_code == 200
-        data = json.loads(response.data)
         
-        # Should not have 'Add item...' option
-        options = data['dropdowns']['Role']['options']
-        assert 'Add item...' not in options
+        options = response.get_json()['dropdowns']['Role']['options']
+        if add_item_first:
+            assert len(options) > 0
+            assert options[0] == 'Add item...'
+        else:
+            assert 'Add item...' not in options
     
-    def test_edit_mode_has_placeholder_text(self):
-        """Test that edit mode has 'Type anything.' placeholder."""
-        response = self.client.post('/template/generate', 
-                                  json={
-                                      'template': self.template,
-                                      'edit_mode': True
-                                  },
-                                  content_type='application/json')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        # Should have placeholder text in the response
-        assert 'placeholder' in data['dropdowns']['Role']
-        assert data['dropdowns']['Role']['placeholder'] == 'Type anything.'
-    
-    def test_regular_mode_has_standard_placeholder(self):
-        """Test that regular mode has standard placeholder."""
-        response = self.client.post('/template/generate', 
-                                  json={
-                                      'template': self.template,
-                                      'edit_mode': False
-                                  },
-                                  content_type='application/json')
-        
+    @pytest.mark.parametrize("response_fixture, placeholder", [
+        ("edit_response", 'Type anything.'),
+        ("regular_response", 'Select or enter Role...'),
+    ])
+    def test_placeholder_text_for_mode(self, request, response_fixture, placeholder):
+        """Test that each mode has its own placeholder text."""
+        response = request.getfixturevalue(response_fixture)
         assert response.status_code == 200
-        data = json.loads(response.data)
         
-        # Should have standard placeholder
-        assert 'placeholder' in data['dropdowns']['Role']
-        assert data['dropdowns']['Role']['placeholder'] == 'Select or enter Role...'
+        role = response.get_json()['dropdowns']['Role']
+        assert 'placeholder' in role
+        assert role['placeholder'] == placeholder
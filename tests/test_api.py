@@ -1,395 +1,259 @@
 # tests/test_api.py
 
 import pytest
-import json
-import tempfile
-import os
-from src.prompt_manager.api import PromptManagerAPI
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, Mock
+from prompt_manager.business.llm_provider import OpenAIProvider
+
+
+# Prompt the create, get, update and delete tests start from
+TEST_PROMPT = {
+    'name': 'Test Prompt',
+    'text': 'This is a test prompt',
+    'category': 'test'
+}
+
+# Prompts the search, category and suggestion tests run against
+SEED_PROMPTS = [
+    {'name': 'Python Tutorial', 'text': 'Learn Python programming', 'category': 'tutorial'},
+    {'name': 'JavaScript Guide', 'text': 'Learn JavaScript basics', 'category': 'tutorial'},
+    {'name': 'Hello World', 'text': 'Greeting prompt', 'category': 'greeting'}
+]
+
+
+@pytest.fixture
+def seeded_client(client, prompt_api):
+    """Client whose store already holds SEED_PROMPTS, added without going through HTTP."""
+    for prompt_data in SEED_PROMPTS:
+        prompt_api.manager.add_prompt(**prompt_data)
+    return client
+
+
+@pytest.fixture
+def created_prompt(client):
+    """A prompt created through the API, as the API returned it."""
+    create_response = client.post('/api/prompts', json=TEST_PROMPT)
+    assert create_response.status_code == 201
+    return create_response.get_json()
 
 
 class TestPromptManagerAPI:
-    def setup_method(self):
-        """Setup test API with temporary storage."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False, mode='w') as tmp:
-            # Write valid empty JSON structure to avoid parsing errors
-            json.dump({"prompts": {}}, tmp)
-            self.temp_storage = tmp.name
-        
-        self.api = PromptManagerAPI(self.temp_storage)
-        self.client = self.api.app.test_client()
-    
-    def teardown_method(self):
-        """Cleanup temporary files."""
-        try:
-            os.unlink(self.temp_storage)
-        except:
-            pass
-    
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health check endpoint."""
-        response = self.client.get('/api/health')
+        response = client.get('/api/health')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['status'] == 'healthy'
     
-    def test_get_prompts_empty(self):
+    def test_get_prompts_empty(self, client):
         """Test getting prompts when none exist."""
-        response = self.client.get('/api/prompts')
+        response = client.get('/api/prompts')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data == []
     
-    def test_create_prompt_success(self):
+    def test_create_prompt_success(self, client):
         """Test creating a prompt successfully."""
-        prompt_data = {
-            'name': 'Test Prompt',
-            'text': 'This is a test prompt',
-            'category': 'test'
-        }
-        
-        response = self.client.post('/api/prompts', 
-                                  data=json.dumps(prompt_data),
-                                  content_type='application/json')
+        response = client.post('/api/prompts', json=TEST_PROMPT)
         
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['name'] == 'Test Prompt'
         assert data['text'] == 'This is a test prompt'
         assert data['category'] == 'test'
         assert 'id' in data
     
-    def test_create_prompt_validation_error(self):
+    def test_create_prompt_validation_error(self, client):
         """Test creating a prompt with validation errors."""
-        prompt_data = {
-            'name': '',  # Empty name should fail validation
-            'text': 'This is a test prompt',
-            'category': 'test'
-        }
+        prompt_data = {**TEST_PROMPT, 'name': ''}  # Empty name should fail validation
         
-        response = self.client.post('/api/prompts', 
-                                  data=json.dumps(prompt_data),
-                                  content_type='application/json')
+        response = client.post('/api/prompts', json=prompt_data)
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'Name is required' in data['error']
     
-    def test_create_prompt_no_data(self):
+    def test_create_prompt_no_data(self, client):
         """Test creating a prompt with no data."""
-        response = self.client.post('/api/prompts', 
-                                  data='',
-                                  content_type='application/json')
+        response = client.post('/api/prompts', data=b'', content_type='application/json')
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['error'] == 'No data provided'
     
-    def test_get_prompt_by_id(self):
+    def test_get_prompt_by_id(self, client, created_prompt):
         """Test getting a specific prompt by ID."""
-        # First create a prompt
-        prompt_data = {
-            'name': 'Test Prompt',
-            'text': 'This is a test prompt',
-            'category': 'test'
-        }
-        
-        create_response = self.client.post('/api/prompts', 
-                                         data=json.dumps(prompt_data),
-                                         content_type='application/json')
-        created_prompt = json.loads(create_response.data)
         prompt_id = created_prompt['id']
         
-        # Then get the prompt by ID
-        response = self.client.get(f'/api/prompts/{prompt_id}')
+        response = client.get(f'/api/prompts/{prompt_id}')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['id'] == prompt_id
         assert data['name'] == 'Test Prompt'
     
-    def test_get_prompt_not_found(self):
+    def test_get_prompt_not_found(self, client):
         """Test getting a non-existent prompt."""
-        response = self.client.get('/api/prompts/non-existent-id')
+        response = client.get('/api/prompts/non-existent-id')
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['error'] == 'Prompt not found'
     
-    def test_update_prompt_success(self):
-        """Test updating a prompt successfully."""
-        # First create a prompt
-        prompt_data = {
-            'name': 'Original Name',
-            'text': 'Original text',
-            'category': 'original'
-        }
-        
-        create_response = self.client.post('/api/prompts', 
-                                         data=json.dumps(prompt_data),
-                                         content_type='application/json')
-        created_prompt = json.loads(create_response.data)
-        prompt_id = created_prompt['id']
-        
-        # Then update the prompt
-        update_data = {
-            'name': 'Updated Name',
-            'text': 'Updated text',
-            'category': 'updated'
-        }
-        
-        response = self.client.put(f'/api/prompts/{prompt_id}', 
-                                 data=json.dumps(update_data),
-                                 content_type='application/json')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['name'] == 'Updated Name'
-        assert data['text'] == 'Updated text'
-        assert data['category'] == 'updated'
+    @pytest.mark.parametrize("update_data, expected_status, expected", [
+        # Valid update: every field changes
+        ({'name': 'Updated Name', 'text': 'Updated text', 'category': 'updated'},
+         200, {'name': 'Updated Name', 'text': 'Updated text', 'category': 'updated'}),
+        # Empty name should fail validation
+        ({'name': '', 'text': 'Updated text'},
+         400, {'error': 'Name is required'}),
+    ], ids=["success", "validation_error"])
+    def test_update_prompt(self, client, created_prompt, update_data, expected_status, expected):
+        """Test updating a prompt, successfully and with validation errors."""
+        response = client.put(f"/api/prompts/{created_prompt['id']}", json=update_data)
+        
+        assert response.status_code == expected_status
+        data = response.get_json()
+        for key, value in expected.items():
+            assert data[key] == value
     
-    def test_update_prompt_not_found(self):
+    def test_update_prompt_not_found(self, client):
         """Test updating a non-existent prompt."""
         update_data = {
             'name': 'Updated Name',
             'text': 'Updated text'
         }
         
-        response = self.client.put('/api/prompts/non-existent-id', 
-                                 data=json.dumps(update_data),
-                                 content_type='application/json')
+        response = client.put('/api/prompts/non-existent-id', json=update_data)
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['error'] == 'Prompt not found'
     
-    def test_update_prompt_validation_error(self):
-        """Test updating a prompt with validation errors."""
-        # First create a prompt
-        prompt_data = {
-            'name': 'Original Name',
-            'text': 'Original text',
-            'category': 'original'
-        }
-        
-        create_response = self.client.post('/api/prompts', 
-                                         data=json.dumps(prompt_data),
-                                         content_type='application/json')
-        created_prompt = json.loads(create_response.data)
-        prompt_id = created_prompt['id']
-        
-        # Then update with invalid data
-        update_data = {
-            'name': '',  # Empty name should fail validation
-            'text': 'Updated text'
-        }
-        
-        response = self.client.put(f'/api/prompts/{prompt_id}', 
-                                 data=json.dumps(update_data),
-                                 content_type='application/json')
-        
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'Name is required' in data['error']
-    
-    def test_delete_prompt_success(self):
+    def test_delete_prompt_success(self, client, created_prompt):
         """Test deleting a prompt successfully."""
-        # First create a prompt
-        prompt_data = {
-            'name': 'Test Prompt',
-            'text': 'This is a test prompt',
-            'category': 'test'
-        }
-        
-        create_response = self.client.post('/api/prompts', 
-                                         data=json.dumps(prompt_data),
-                                         content_type='application/json')
-        created_prompt = json.loads(create_response.data)
         prompt_id = created_prompt['id']
         
-        # Then delete the prompt
-        response = self.client.delete(f'/api/prompts/{prompt_id}')
+        response = client.delete(f'/api/prompts/{prompt_id}')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['message'] == 'Prompt deleted successfully'
         
         # Verify prompt is deleted
-        get_response = self.client.get(f'/api/prompts/{prompt_id}')
+        get_response = client.get(f'/api/prompts/{prompt_id}')
         assert get_response.status_code == 404
     
-    def test_delete_prompt_not_found(self):
+    def test_delete_prompt_not_found(self, client):
         """Test deleting a non-existent prompt."""
-        response = self.client.delete('/api/prompts/non-existent-id')
+        response = client.delete('/api/prompts/non-existent-id')
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['error'] == 'Prompt not found'
     
-    def test_search_prompts_by_query(self):
-        """Test searching prompts by query."""
-        # Create some test prompts
-        prompts = [
-            {'name': 'Python Tutorial', 'text': 'Learn Python programming', 'category': 'tutorial'},
-            {'name': 'JavaScript Guide', 'text': 'Learn JavaScript basics', 'category': 'tutorial'},
-            {'name': 'Hello World', 'text': 'Greeting prompt', 'category': 'greeting'}
-        ]
-        
-        for prompt_data in prompts:
-            self.client.post('/api/prompts', 
-                           data=json.dumps(prompt_data),
-                           content_type='application/json')
-        
-        # Search for "python"
-        response = self.client.get('/api/search?q=python')
+    @pytest.mark.parametrize("query, expected_names", [
+        ("q=python", {'Python Tutorial'}),
+        ("category=tutorial", {'Python Tutorial', 'JavaScript Guide'}),
+    ], ids=["by_query", "by_category"])
+    def test_search_prompts(self, seeded_client, query, expected_names):
+        """Test searching prompts by query and by category."""
+        response = seeded_client.get(f'/api/search?{query}')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
-        assert len(data) == 1
-        assert data[0]['name'] == 'Python Tutorial'
-    
-    def test_search_prompts_by_category(self):
-        """Test searching prompts by category."""
-        # Create some test prompts
-        prompts = [
-            {'name': 'Python Tutorial', 'text': 'Learn Python programming', 'category': 'tutorial'},
-            {'name': 'JavaScript Guide', 'text': 'Learn JavaScript basics', 'category': 'tutorial'},
-            {'name': 'Hello World', 'text': 'Greeting prompt', 'category': 'greeting'}
-        ]
-        
-        for prompt_data in prompts:
-            self.client.post('/api/prompts', 
-                           data=json.dumps(prompt_data),
-                           content_type='application/json')
-        
-        # Search by category
-        response = self.client.get('/api/search?category=tutorial')
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert len(data) == 2
-        for prompt in data:
-            assert prompt['category'] == 'tutorial'
+        data = response.get_json()
+        assert len(data) == len(expected_names)
+        assert {prompt['name'] for prompt in data} == expected_names
     
-    def test_search_prompts_no_criteria(self):
+    def test_search_prompts_no_criteria(self, client):
         """Test search with no criteria."""
-        response = self.client.get('/api/search')
+        response = client.get('/api/search')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert isinstance(data, list)  # Should return all prompts
     
-    def test_get_categories(self):
+    def test_get_categories(self, seeded_client):
         """Test getting all categories."""
-        # Create prompts with different categories
-        prompts = [
-            {'name': 'Prompt 1', 'text': 'Text 1', 'category': 'tutorial'},
-            {'name': 'Prompt 2', 'text': 'Text 2', 'category': 'greeting'},
-            {'name': 'Prompt 3', 'text': 'Text 3', 'category': 'tutorial'}
-        ]
-        
-        for prompt_data in prompts:
-            self.client.post('/api/prompts', 
-                           data=json.dumps(prompt_data),
-                           content_type='application/json')
-        
-        response = self.client.get('/api/categories')
+        response = seeded_client.get('/api/categories')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'tutorial' in data
         assert 'greeting' in data
         assert len(data) == 2  # Should be unique categories
     
-    def test_get_suggestions(self):
+    def test_get_suggestions(self, seeded_client):
         """Test getting search suggestions."""
-        # Create prompts
-        prompts = [
-            {'name': 'Python Tutorial', 'text': 'Learn Python programming', 'category': 'tutorial'},
-            {'name': 'JavaScript Guide', 'text': 'Learn JavaScript basics', 'category': 'tutorial'}
-        ]
-        
-        for prompt_data in prompts:
-            self.client.post('/api/prompts', 
-                           data=json.dumps(prompt_data),
-                           content_type='application/json')
-        
-        response = self.client.get('/api/suggestions?q=py')
+        response = seeded_client.get('/api/suggestions?q=py')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'Python Tutorial' in data
     
-    def test_get_suggestions_empty_query(self):
+    def test_get_suggestions_empty_query(self, client):
         """Test getting suggestions with empty query."""
-        response = self.client.get('/api/suggestions?q=')
+        response = client.get('/api/suggestions?q=')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data == []
     
-    def test_get_prompts_with_filtering(self):
+    def test_get_prompts_with_filtering(self, seeded_client):
         """Test getting prompts with query and category filtering."""
-        # Create test prompts
-        prompts = [
-            {'name': 'Python Tutorial', 'text': 'Learn Python programming', 'category': 'tutorial'},
-            {'name': 'JavaScript Guide', 'text': 'Learn JavaScript basics', 'category': 'tutorial'},
-            {'name': 'Hello World', 'text': 'Greeting prompt', 'category': 'greeting'}
-        ]
-        
-        for prompt_data in prompts:
-            self.client.post('/api/prompts', 
-                           data=json.dumps(prompt_data),
-                           content_type='application/json')
-        
         # Test filtering by category
-        response = self.client.get('/api/prompts?category=tutorial')
+        response = seeded_client.get('/api/prompts?category=tutorial')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) == 2
         for prompt in data:
             assert prompt['category'] == 'tutorial'
         
         # Test filtering by query
-        response = self.client.get('/api/prompts?query=python')
+        response = seeded_client.get('/api/prompts?query=python')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) == 1
-        assert data[0]['name'] == 'Python Tutorial' 
+        assert data[0]['name'] == 'Python Tutorial'
 
-def test_llm_chat_success(client):
-    """Test /api/llm/chat returns a response from the LLM provider."""
-    with patch('prompt_manager.api.OpenAIProvider') as mock_provider, \
+@pytest.fixture
+def mocked_openai():
+    """Patch the API's OpenAI provider and key loader for one test.
+    
+    Yields a namespace with the provider instance the API will get and the key loader mock.
+    """
+    with patch('prompt_manager.api.OpenAIProvider') as mock_provider_class, \
          patch('prompt_manager.api.load_openai_api_key') as mock_key_loader:
-        mock_key_loader.return_value = 'sk-test'
-        mock_instance = mock_provider.return_value
-        mock_instance.send_prompt.return_value = 'LLM response'
-        response = client.post('/api/llm/chat', json={"prompt": "Hello"})
-        assert response.status_code == 200
-        assert response.json == {"response": "LLM response"}
+        # A spec'd instance is cheaper than a MagicMock and rejects unknown methods
+        provider = mock_provider_class.return_value = Mock(spec=OpenAIProvider)
+        yield SimpleNamespace(provider=provider, key_loader=mock_key_loader)
+
+def test_llm_chat_success(client, mocked_openai):
+    """Test /api/llm/chat returns a response from the LLM provider."""
+    mocked_openai.key_loader.return_value = 'sk-test'
+    mocked_openai.provider.send_prompt.return_value = 'LLM response'
+    response = client.post('/api/llm/chat', json={"prompt": "Hello"})
+    assert response.status_code == 200
+    assert response.json == {"response": "LLM response"}
 
-def test_llm_chat_missing_key(client):
+def test_llm_chat_missing_key(client, mocked_openai):
     """Test /api/llm/chat returns error if key is missing."""
-    with patch('prompt_manager.api.load_openai_api_key') as mock_key_loader:
-        mock_key_loader.side_effect = ValueError('No key')
-        response = client.post('/api/llm/chat', json={"prompt": "Hello"})
-        assert response.status_code == 400
-        assert 'error' in response.json
+    mocked_openai.key_loader.side_effect = ValueError('No key')
+    response = client.post('/api/llm/chat', json={"prompt": "Hello"})
+    assert response.status_code == 400
+    assert 'error' in response.json
 
-def test_llm_chat_provider_error(client):
+def test_llm_chat_provider_error(client, mocked_openai):
     """Test /api/llm/chat returns error if provider fails."""
-    with patch('prompt_manager.api.OpenAIProvider') as mock_provider, \
-         patch('prompt_manager.api.load_openai_api_key') as mock_key_loader:
-        mock_key_loader.return_value = 'sk-test'
-        mock_instance = mock_provider.return_value
-        mock_instance.send_prompt.side_effect = Exception('Provider error')
-        response = client.post('/api/llm/chat', json={"prompt": "Hello"})
-        assert response.status_code == 500
-        assert 'error' in response.json 
+    mocked_openai.key_loader.return_value = 'sk-test'
+    mocked_openai.provider.send_prompt.side_effect = Exception('Provider error')
+    response = client.post('/api/llm/chat', json={"prompt": "Hello"})
+    assert response.status_code == 500
+    assert 'error' in response.json 
 
 def test_get_llm_config_key(client, monkeypatch):
     """Test GET /api/llm/config returns the current provider and key status."""
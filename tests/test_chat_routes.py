@@ -4,227 +4,173 @@ Tests for chat dashboard routes.
 Following TDD principles - tests written first!
 """
 
-import pytest
 import json
-from unittest.mock import Mock, patch, MagicMock
-from flask import Flask
-from routes.dashboard import dashboard_bp
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
 from src.prompt_manager.business.llm_provider_manager import LLMProviderManager
 
-
-@pytest.fixture
-def app():
-    """Create test Flask app."""
-    app = Flask(__name__,
-               template_folder='src/prompt_manager/templates')
-    app.config['TESTING'] = True
-    app.register_blueprint(dashboard_bp)
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
+# Chat request bodies posted more than once, encoded once for the module
+TEST_MESSAGE_PAYLOAD = json.dumps({'message': 'Test'}).encode()
+GPT35_MESSAGE_PAYLOAD = json.dumps({'message': 'Test', 'model': 'gpt-3.5-turbo'}).encode()
+GPT4_MESSAGE_PAYLOAD = json.dumps({'message': 'Test', 'model': 'gpt-4'}).encode()
 
 
 class TestChatRoutes:
     """Test chat dashboard routes."""
     
     @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_chat_dashboard_renders(self, client):
-        """Test that chat dashboard page loads."""
-        response = client.get('/chat')
+    @pytest.mark.parametrize('needle', [
+        b'Chat - Prompt Manager', b'control-panel',
+        b'model-select', b'gpt-4-turbo-preview', b'gpt-3.5-turbo',
+        b'toggle-panel-btn', b'Hide Controls',
+        b'prompts-btn', b'regenerate-btn', b'export-btn', b'clear-btn',
+    ])
+    def test_chat_dashboard_contains(self, dashboard_client, needle):
+        """Test that the chat dashboard renders with its model selection, controls and quick actions."""
+        response = dashboard_client.get('/chat')
         assert response.status_code == 200
-        assert b'Chat - Prompt Manager' in response.data
-        assert b'control-panel' in response.data
-    
-    @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_chat_dashboard_has_model_selection(self, client):
-        """Test that chat dashboard includes model selection dropdown."""
-        response = client.get('/chat')
-        assert b'model-select' in response.data
-        assert b'gpt-4-turbo-preview' in response.data
-        assert b'gpt-3.5-turbo' in response.data
-    
-    @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_chat_dashboard_has_collapsible_controls(self, client):
-        """Test that chat dashboard has collapsible control panel."""
-        response = client.get('/chat')
-        assert b'toggle-panel-btn' in response.data
-        assert b'Hide Controls' in response.data
-    
-    @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_chat_dashboard_has_quick_actions(self, client):
-        """Test that chat dashboard has quick action buttons."""
-        response = client.get('/chat')
-        assert b'prompts-btn' in response.data
-        assert b'regenerate-btn' in response.data
-        assert b'export-btn' in response.data
-        assert b'clear-btn' in response.data
+        assert needle in response.data
 
 
 class TestSettingsRoute:
     """Test settings page route."""
     
     @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_settings_page_renders(self, client):
-        """Test that settings page loads."""
-        response = client.get('/settings')
+    @pytest.mark.parametrize('needle', [
+        b'Settings', b'API Key',
+        b'openai', b'anthropic', b'google',
+        b'Back to Chat', b'/chat',
+    ])
+    def test_settings_page_contains(self, dashboard_client, needle):
+        """Test that the settings page renders with its provider selection and back button."""
+        response = dashboard_client.get('/settings')
         assert response.status_code == 200
-        assert b'Settings' in response.data
-        assert b'API Key' in response.data
-    
-    @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_settings_has_provider_selection(self, client):
-        """Test that settings page has provider dropdown."""
-        response = client.get('/settings')
-        assert b'openai' in response.data
-        assert b'anthropic' in response.data
-        assert b'google' in response.data
-    
-    @pytest.mark.skip(reason="Template rendering tests require full app context")
-    def test_settings_has_back_button(self, client):
-        """Test that settings page has back to chat button."""
-        response = client.get('/settings')
-        assert b'Back to Chat' in response.data
-        assert b'/chat' in response.data
+        assert needle in response.data
 
 
 class TestChatSendAPI:
     """Test chat message sending API."""
     
-    @patch('routes.dashboard.provider_manager')
-    def test_send_message_success(self, mock_manager, client):
+    def test_send_message_success(self, mock_provider, dashboard_client):
         """Test successful message sending."""
         # Setup mock
-        mock_provider = Mock()
         mock_provider.generate.return_value = "Test response from LLM"
-        mock_manager.get_provider.return_value = mock_provider
         
         # Send request
-        response = client.post('/api/chat/send',
-                              json={
-                                  'message': 'Test message',
-                                  'provider': 'openai',
-                                  'model': 'gpt-3.5-turbo',
-                                  'temperature': 0.7,
-                                  'max_tokens': 2048
-                              })
+        response = dashboard_client.post('/api/chat/send',
+                                        json={
+                                            'message': 'Test message',
+                                            'provider': 'openai',
+                                            'model': 'gpt-3.5-turbo',
+                                            'temperature': 0.7,
+                                            'max_tokens': 2048
+                                        })
         
         # Assertions
         assert response.status_code == 200
-        data = json.loads(response.data)
-        assert data['response'] == "Test response from LLM"
-        assert data['model'] == 'gpt-3.5-turbo'
-        assert data['temperature'] == 0.7
+        data = response.get_json()
+        expected = {'response': "Test response from LLM", 'model': 'gpt-3.5-turbo', 'temperature': 0.7}
+        assert {key: data[key] for key in expected} == expected
         
         # Verify provider was called with messages array
         call_kwargs = mock_provider.generate.call_args[1]
         assert 'messages' in call_kwargs
-        assert call_kwargs['model'] == 'gpt-3.5-turbo'
-        assert call_kwargs['temperature'] == 0.7
-        assert call_kwargs['max_tokens'] == 2048
+        expected_kwargs = {'model': 'gpt-3.5-turbo', 'temperature': 0.7, 'max_tokens': 2048}
+        assert {key: call_kwargs[key] for key in expected_kwargs} == expected_kwargs
     
-    @patch('routes.dashboard.provider_manager')
-    def test_send_message_missing_provider(self, mock_manager, client):
+    def test_send_message_missing_provider(self, mock_provider_manager, dashboard_client):
         """Test sending message when provider not found."""
-        mock_manager.get_provider.return_value = None
+        mock_provider_manager.get_provider.return_value = None
         
-        response = client.post('/api/chat/send',
-                              json={
-                                  'message': 'Test message',
-                                  'provider': 'nonexistent'
-                              })
+        response = dashboard_client.post('/api/chat/send',
+                                        json={
+                                            'message': 'Test message',
+                                            'provider': 'nonexistent'
+                                        })
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
         assert 'not found' in data['error'].lower()
     
-    def test_send_message_missing_message(self, client):
+    def test_send_message_missing_message(self, dashboard_client):
         """Test sending request without message."""
-        response = client.post('/api/chat/send',
-                              json={
-                                  'provider': 'openai'
-                              })
+        response = dashboard_client.post('/api/chat/send',
+                                        json={
+                                            'provider': 'openai'
+                                        })
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
         assert 'required' in data['error'].lower()
     
-    @patch('routes.dashboard.provider_manager')
-    def test_send_message_with_defaults(self, mock_manager, client):
+    def test_send_message_with_defaults(self, mock_provider, dashboard_client):
         """Test that defaults are applied when not provided."""
-        mock_provider = Mock()
-        mock_provider.generate.return_value = "Response"
-        mock_manager.get_provider.return_value = mock_provider
-        
-        response = client.post('/api/chat/send',
-                              json={'message': 'Test'})
+        response = dashboard_client.post('/api/chat/send',
+                                        data=TEST_MESSAGE_PAYLOAD,
+                                        content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['provider'] == 'openai'  # default
         assert data['model'] == 'gpt-3.5-turbo'  # default
         assert data['temperature'] == 0.7  # default
         assert data['max_tokens'] == 2048  # default
     
-    @patch('routes.dashboard.provider_manager')
-    def test_send_message_provider_error(self, mock_manager, client):
+    def test_send_message_provider_error(self, mock_provider, dashboard_client):
         """Test handling of provider errors."""
-        mock_provider = Mock()
         mock_provider.generate.side_effect = Exception("API Error")
-        mock_manager.get_provider.return_value = mock_provider
         
-        response = client.post('/api/chat/send',
-                              json={'message': 'Test'})
+        response = dashboard_client.post('/api/chat/send',
+                                        data=TEST_MESSAGE_PAYLOAD,
+                                        content_type='application/json')
         
         assert response.status_code == 500
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
 
 
 class TestModelsListAPI:
     """Test models list API."""
     
-    def test_list_openai_models(self, client):
+    def test_list_openai_models(self, dashboard_client):
         """Test listing OpenAI models."""
-        response = client.get('/api/models/list?provider=openai')
+        response = dashboard_client.get('/api/models/list?provider=openai')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'models' in data
         assert 'gpt-4-turbo-preview' in data['models']
         assert 'gpt-4' in data['models']
         assert 'gpt-3.5-turbo' in data['models']
         assert 'gpt-3.5-turbo-16k' in data['models']
     
-    def test_list_models_default_provider(self, client):
+    def test_list_models_default_provider(self, dashboard_client):
         """Test listing models with default provider."""
-        response = client.get('/api/models/list')
+        response = dashboard_client.get('/api/models/list')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'models' in data
         # Should default to openai
         assert len(data['models']) > 0
     
-    def test_list_models_unknown_provider(self, client):
+    def test_list_models_unknown_provider(self, dashboard_client):
         """Test listing models for unknown provider."""
-        response = client.get('/api/models/list?provider=unknown')
+        response = dashboard_client.get('/api/models/list?provider=unknown')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'models' in data
         assert len(data['models']) == 0
     
-    def test_model_details_included(self, client):
+    def test_model_details_included(self, dashboard_client):
         """Test that model details are included."""
-        response = client.get('/api/models/list?provider=openai')
+        response = dashboard_client.get('/api/models/list?provider=openai')
         
-        data = json.loads(response.data)
+        data = response.get_json()
         gpt4_turbo = data['models']['gpt-4-turbo-preview']
         
         assert 'name' in gpt4_turbo
@@ -236,157 +182,131 @@ class TestModelsListAPI:
 class TestProvidersAPI:
     """Test providers management API."""
     
-    @patch('routes.dashboard.provider_manager')
-    @patch('routes.dashboard.SecureKeyManager')
-    @patch('routes.dashboard.OpenAIProvider')
-    def test_add_provider_success(self, mock_provider_class, mock_key_manager_class, mock_manager, client):
+    def test_add_provider_success(self, monkeypatch, mock_provider_manager, dashboard_client):
         """Test successfully adding a provider."""
         # Setup mocks
-        mock_provider = Mock()
-        mock_provider.is_available.return_value = True
-        mock_provider_class.return_value = mock_provider
+        monkeypatch.setattr('routes.dashboard.OpenAIProvider',
+                            Mock(return_value=SimpleNamespace(is_available=lambda: True)))
         
         mock_key_manager = Mock()
         mock_key_manager.save_key.return_value = True
-        mock_key_manager_class.return_value = mock_key_manager
+        monkeypatch.setattr('routes.dashboard.SecureKeyManager', Mock(return_value=mock_key_manager))
         
         # Send request
-        response = client.post('/api/providers/add',
-                              json={
-                                  'name': 'openai',
-                                  'api_key': 'sk-test123'
-                              })
+        response = dashboard_client.post('/api/providers/add',
+                                        json={
+                                            'name': 'openai',
+                                            'api_key': 'sk-test123'
+                                        })
         
         # Assertions
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'message' in data
         assert 'openai' in data['message'].lower()
         
         # Verify provider was added
-        mock_manager.add_provider.assert_called_once()
+        mock_provider_manager.add_provider.assert_called_once()
         
         # Verify key was saved
         mock_key_manager.save_key.assert_called_once_with('openai_api_key', 'sk-test123')
     
-    def test_add_provider_missing_fields(self, client):
+    def test_add_provider_missing_fields(self, dashboard_client):
         """Test adding provider without required fields."""
-        response = client.post('/api/providers/add',
-                              json={'name': 'openai'})
+        response = dashboard_client.post('/api/providers/add',
+                                        json={'name': 'openai'})
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
     
-    def test_add_provider_unsupported(self, client):
+    def test_add_provider_unsupported(self, dashboard_client):
         """Test adding unsupported provider."""
-        response = client.post('/api/providers/add',
-                              json={
-                                  'name': 'unsupported',
-                                  'api_key': 'test123'
-                              })
+        response = dashboard_client.post('/api/providers/add',
+                                        json={
+                                            'name': 'unsupported',
+                                            'api_key': 'test123'
+                                        })
         
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
         assert 'currently supported' in data['error'].lower()
     
-    @patch('routes.dashboard.provider_manager')
-    def test_list_providers(self, mock_manager, client):
+    def test_list_providers(self, monkeypatch, dashboard_client):
         """Test listing all providers."""
-        # Setup mock
-        mock_provider = Mock()
-        mock_provider.name = 'openai'
-        mock_provider.is_available.return_value = True
-        mock_manager.providers = {'openai': mock_provider}
-        mock_manager.default_provider = None
+        # Setup stub
+        provider = SimpleNamespace(name='openai', is_available=lambda: True)
+        monkeypatch.setattr('routes.dashboard.provider_manager',
+                            SimpleNamespace(providers={'openai': provider}, default_provider=None))
         
-        response = client.get('/api/providers/list')
+        response = dashboard_client.get('/api/providers/list')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'providers' in data
         assert 'openai' in data['providers']
         assert data['providers']['openai']['is_available'] == True
     
-    @patch('routes.dashboard.provider_manager')
-    @patch('routes.dashboard.SecureKeyManager')
-    def test_remove_provider(self, mock_key_manager_class, mock_manager, client):
+    def test_remove_provider(self, monkeypatch, mock_provider_manager, dashboard_client):
         """Test removing a provider."""
         # Setup mocks
-        mock_manager.providers = {'openai': Mock()}
+        mock_provider_manager.providers = {'openai': SimpleNamespace(name='openai')}
         mock_key_manager = Mock()
-        mock_key_manager_class.return_value = mock_key_manager
+        monkeypatch.setattr('routes.dashboard.SecureKeyManager', Mock(return_value=mock_key_manager))
         
-        response = client.delete('/api/providers/remove/openai')
+        response = dashboard_client.delete('/api/providers/remove/openai')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'message' in data
         
         # Verify provider was removed
-        mock_manager.remove_provider.assert_called_once_with('openai')
+        mock_provider_manager.remove_provider.assert_called_once_with('openai')
         
         # Verify key was deleted
         mock_key_manager.delete_key.assert_called_once_with('openai_api_key')
     
-    @patch('routes.dashboard.provider_manager')
-    def test_remove_nonexistent_provider(self, mock_manager, client):
+    def test_remove_nonexistent_provider(self, monkeypatch, dashboard_client):
         """Test removing a provider that doesn't exist."""
-        mock_manager.providers = {}
+        monkeypatch.setattr('routes.dashboard.provider_manager', SimpleNamespace(providers={}))
         
-        response = client.delete('/api/providers/remove/nonexistent')
+        response = dashboard_client.delete('/api/providers/remove/nonexistent')
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
 
 
 class TestChatIntegration:
     """Integration tests for chat functionality."""
     
-    @patch('routes.dashboard.provider_manager')
-    def test_full_chat_workflow(self, mock_manager, client):
-        """Test complete chat workflow."""
-        # Setup
-        mock_provider = Mock()
-        mock_provider.generate.return_value = "Hello! How can I help?"
-        mock_manager.get_provider.return_value = mock_provider
-        
-        # 1. Send first message
-        response1 = client.post('/api/chat/send',
-                               json={
-                                   'message': 'Hello',
-                                   'model': 'gpt-4'
-                               })
-        assert response1.status_code == 200
-        
-        # 2. Send follow-up message
-        mock_provider.generate.return_value = "I can help with that!"
-        response2 = client.post('/api/chat/send',
-                               json={
-                                   'message': 'Can you help me?',
-                                   'model': 'gpt-4'
-                               })
-        assert response2.status_code == 200
-        
-        # Verify both calls were made
-        assert mock_provider.generate.call_count == 2
+    @pytest.mark.parametrize('message,model,expected', [
+        ('Hello', 'gpt-4', 'Hello! How can I help?'),
+        ('Can you help me?', 'gpt-4', 'I can help with that!'),
+    ], ids=['greeting', 'follow_up'])
+    def test_chat_turn(self, mock_provider, dashboard_client, message, model, expected):
+        """Test that each turn of a chat is answered by the provider."""
+        mock_provider.generate.return_value = expected
+        
+        response = dashboard_client.post('/api/chat/send',
+                                        json={'message': message, 'model': model})
+        
+        assert response.status_code == 200
+        assert response.get_json()['response'] == expected
+        mock_provider.generate.assert_called_once()
     
-    @patch('routes.dashboard.provider_manager')
-    def test_model_switching(self, mock_manager, client):
+    def test_model_switching(self, mock_provider, dashboard_client):
         """Test switching between models."""
-        mock_provider = Mock()
-        mock_provider.generate.return_value = "Response"
-        mock_manager.get_provider.return_value = mock_provider
-        
         # Send with GPT-3.5
-        client.post('/api/chat/send',
-                   json={'message': 'Test', 'model': 'gpt-3.5-turbo'})
+        dashboard_client.post('/api/chat/send',
+                             data=GPT35_MESSAGE_PAYLOAD,
+                             content_type='application/json')
         
         # Send with GPT-4
-        client.post('/api/chat/send',
-                   json={'message': 'Test', 'model': 'gpt-4'})
+        dashboard_client.post('/api/chat/send',
+                             data=GPT4_MESSAGE_PAYLOAD,
+                             content_type='application/json')
         
         # Verify different models were used
         calls = mock_provider.generate.call_args_list
@@ -1,8 +1,6 @@
 # tests/test_cli.py
 
 import pytest
-import tempfile
-import os
 import json
 from unittest.mock import patch, mock_open
 from src.prompt_manager.cli import PromptManagerCLI
@@ -10,19 +8,11 @@ from src.prompt_manager.cli import PromptManagerCLI
 
 class TestPromptManagerCLI:
     @pytest.fixture
-    def temp_cli(self):
+    def temp_cli(self, tmp_path):
         """Create a CLI instance with a temporary storage file."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
-            tmp_path = tmp.name
-        
-        cli = PromptManagerCLI(tmp_path)
-        yield cli
-        
-        # Cleanup
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+        storage = tmp_path / "prompts.json"
+        storage.touch()
+        return PromptManagerCLI(str(storage))
     
     def test_add_prompt_with_text(self, temp_cli):
         """Test adding a prompt with provided text."""
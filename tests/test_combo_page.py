@@ -0,0 +1,52 @@
+"""
+Test that the combo test page carries the custom combo box markup and behavior.
+
+The page is fetched once per session and shared by every marker check.
+"""
+
+import pytest
+import requests
+
+from combo_page_markers import (
+    EVENT_LISTENER_MARKERS, FUNCTION_MARKERS, MODE_MARKERS, PAGE_MARKERS, UI_MARKERS,
+)
+
+
+COMBO_PAGE_URL = "http://localhost:8000/combo-test"
+
+
+@pytest.fixture(scope="session")
+def http():
+    """One pooled keep-alive HTTP session shared by the whole test session."""
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def combo_page(http):
+    """Fetch the combo test page once for the whole session."""
+    try:
+        response = http.get(COMBO_PAGE_URL)
+    except requests.ConnectionError:
+        pytest.skip(f"Server is not running at {COMBO_PAGE_URL}")
+    assert response.status_code == 200
+    return response.text
+
+
+@pytest.mark.parametrize(
+    "marker",
+    PAGE_MARKERS + FUNCTION_MARKERS + EVENT_LISTENER_MARKERS + MODE_MARKERS + UI_MARKERS,
+)
+def test_combo_page_has_marker(combo_page, marker):
+    """Test that the combo test page contains each expected marker."""
+    assert marker in combo_page
+
+
+def test_combo_page_loads_bootstrap(combo_page):
+    """Test that the combo test page pulls in Bootstrap."""
+    assert "bootstrap" in combo_page.lower()
+
+
+def test_combo_page_uses_font_awesome(combo_page):
+    """Test that the combo test page uses Font Awesome icons."""
+    assert "font-awesome" in combo_page.lower() or "fas fa-" in combo_page
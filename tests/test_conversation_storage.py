@@ -5,32 +5,13 @@ Following TDD principles - tests written first!
 """
 
 import pytest
-import json
 from unittest.mock import Mock, patch, MagicMock
-from flask import Flask
-from routes.dashboard import dashboard_bp
-
-
-@pytest.fixture
-def app():
-    """Create test Flask app."""
-    app = Flask(__name__,
-               template_folder='src/prompt_manager/templates')
-    app.config['TESTING'] = True
-    app.register_blueprint(dashboard_bp)
-    return app
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
 
 
 class TestConversationPersistence:
     """Test saving and loading conversations."""
     
-    def test_save_conversation(self, client):
+    def test_save_conversation(self, dashboard_client):
         """Test saving a conversation."""
         conversation = {
             'id': 'conv-123',
@@ -43,15 +24,15 @@ class TestConversationPersistence:
             'system_prompt': 'You are helpful'
         }
         
-        response = client.post('/api/conversations/save',
-                              json=conversation)
+        response = dashboard_client.post('/api/conversations/save',
+                                        json=conversation)
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'id' in data
         assert 'message' in data
     
-    def test_load_conversation(self, client):
+    def test_load_conversation(self, dashboard_client):
         """Test loading a saved conversation."""
         # First save
         conversation = {
@@ -59,59 +40,59 @@ class TestConversationPersistence:
             'title': 'Loaded Conversation',
             'messages': [{'role': 'user', 'content': 'Test'}]
         }
-        client.post('/api/conversations/save', json=conversation)
+        dashboard_client.post('/api/conversations/save', json=conversation)
         
         # Then load
-        response = client.get('/api/conversations/load/conv-456')
+        response = dashboard_client.get('/api/conversations/load/conv-456')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['id'] == 'conv-456'
         assert data['title'] == 'Loaded Conversation'
         assert len(data['messages']) == 1
     
-    def test_load_nonexistent_conversation(self, client):
+    def test_load_nonexistent_conversation(self, dashboard_client):
         """Test loading conversation that doesn't exist."""
-        response = client.get('/api/conversations/load/nonexistent')
+        response = dashboard_client.get('/api/conversations/load/nonexistent')
         
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'error' in data
     
-    def test_list_conversations(self, client):
+    def test_list_conversations(self, dashboard_client):
         """Test listing all saved conversations."""
         # Save a few conversations
         for i in range(3):
-            client.post('/api/conversations/save',
-                       json={
-                           'id': f'conv-{i}',
-                           'title': f'Conversation {i}',
-                           'messages': []
-                       })
+            dashboard_client.post('/api/conversations/save',
+                                 json={
+                                     'id': f'conv-{i}',
+                                     'title': f'Conversation {i}',
+                                     'messages': []
+                                 })
         
-        response = client.get('/api/conversations/list')
+        response = dashboard_client.get('/api/conversations/list')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'conversations' in data
         assert len(data['conversations']) >= 3
     
-    def test_delete_conversation(self, client):
+    def test_delete_conversation(self, dashboard_client):
         """Test deleting a conversation."""
         # Save first
-        client.post('/api/conversations/save',
-                   json={'id': 'to-delete', 'title': 'Delete Me', 'messages': []})
+        dashboard_client.post('/api/conversations/save',
+                             json={'id': 'to-delete', 'title': 'Delete Me', 'messages': []})
         
         # Delete
-        response = client.delete('/api/conversations/delete/to-delete')
+        response = dashboard_client.delete('/api/conversations/delete/to-delete')
         
         assert response.status_code == 200
         
         # Verify it's gone
-        load_response = client.get('/api/conversations/load/to-delete')
+        load_response = dashboard_client.get('/api/conversations/load/to-delete')
         assert load_response.status_code == 404
     
-    def test_conversation_auto_title(self, client):
+    def test_conversation_auto_title(self, dashboard_client):
         """Test that conversations get auto-titled from first message."""
         conversation = {
             'messages': [
@@ -120,61 +101,61 @@ class TestConversationPersistence:
             ]
         }
         
-        response = client.post('/api/conversations/save', json=conversation)
+        response = dashboard_client.post('/api/conversations/save', json=conversation)
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'title' in data
         assert len(data['title']) > 0
         # Should use first user message
         assert 'Python' in data['title'] or 'What' in data['title']
     
-    def test_update_existing_conversation(self, client):
+    def test_update_existing_conversation(self, dashboard_client):
         """Test updating an existing conversation."""
         # Save initial
-        client.post('/api/conversations/save',
-                   json={
-                       'id': 'update-test',
-                       'title': 'Original',
-                       'messages': [{'role': 'user', 'content': 'First'}]
-                   })
+        dashboard_client.post('/api/conversations/save',
+                             json={
+                                 'id': 'update-test',
+                                 'title': 'Original',
+                                 'messages': [{'role': 'user', 'content': 'First'}]
+                             })
         
         # Update with more messages
-        response = client.post('/api/conversations/save',
-                              json={
-                                  'id': 'update-test',
-                                  'title': 'Original',
-                                  'messages': [
-                                      {'role': 'user', 'content': 'First'},
-                                      {'role': 'assistant', 'content': 'Response'},
-                                      {'role': 'user', 'content': 'Second'}
-                                  ]
-                              })
+        response = dashboard_client.post('/api/conversations/save',
+                                        json={
+                                            'id': 'update-test',
+                                            'title': 'Original',
+                                            'messages': [
+                                                {'role': 'user', 'content': 'First'},
+                                                {'role': 'assistant', 'content': 'Response'},
+                                                {'role': 'user', 'content': 'Second'}
+                                            ]
+                                        })
         
         assert response.status_code == 200
         
         # Verify update
-        load_response = client.get('/api/conversations/load/update-test')
-        data = json.loads(load_response.data)
+        load_response = dashboard_client.get('/api/conversations/load/update-test')
+        data = load_response.get_json()
         assert len(data['messages']) == 3
 
 
 class TestConversationMetadata:
     """Test conversation metadata and statistics."""
     
-    def test_conversation_includes_timestamps(self, client):
+    def test_conversation_includes_timestamps(self, dashboard_client):
         """Test that saved conversations include timestamps."""
-        response = client.post('/api/conversations/save',
-                              json={
-                                  'title': 'Time Test',
-                                  'messages': []
-                              })
+        response = dashboard_client.post('/api/conversations/save',
+                                        json={
+                                            'title': 'Time Test',
+                                            'messages': []
+                                        })
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'created_at' in data or 'timestamp' in data
     
-    def test_conversation_includes_token_count(self, client):
+    def test_conversation_includes_token_count(self, dashboard_client):
         """Test that conversations track total token usage."""
         conversation = {
             'messages': [
@@ -185,22 +166,22 @@ class TestConversationMetadata:
             }
         }
         
-        response = client.post('/api/conversations/save', json=conversation)
+        response = dashboard_client.post('/api/conversations/save', json=conversation)
         
         assert response.status_code == 200
     
-    def test_list_includes_preview(self, client):
+    def test_list_includes_preview(self, dashboard_client):
         """Test that conversation list includes message preview."""
-        client.post('/api/conversations/save',
-                   json={
-                       'title': 'Preview Test',
-                       'messages': [
-                           {'role': 'user', 'content': 'This is a preview message'}
-                       ]
-                   })
+        dashboard_client.post('/api/conversations/save',
+                             json={
+                                 'title': 'Preview Test',
+                                 'messages': [
+                                     {'role': 'user', 'content': 'This is a preview message'}
+                                 ]
+                             })
         
-        response = client.get('/api/conversations/list')
-        data = json.loads(response.data)
+        response = dashboard_client.get('/api/conversations/list')
+        data = response.get_json()
         
         # Find our conversation
         conv = next((c for c in data['conversations'] if c['title'] == 'Preview Test'), None)
@@ -211,30 +192,30 @@ class TestConversationMetadata:
 class TestConversationOrganization:
     """Test conversation organization features."""
     
-    def test_conversations_sorted_by_date(self, client):
+    def test_conversations_sorted_by_date(self, dashboard_client):
         """Test that conversations are returned sorted by date (newest first)."""
-        response = client.get('/api/conversations/list?sort=date')
+        response = dashboard_client.get('/api/conversations/list?sort=date')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'conversations' in data
         # Verify sorting if multiple conversations exist
     
-    def test_search_conversations(self, client):
+    def test_search_conversations(self, dashboard_client):
         """Test searching conversations by content."""
         # Save searchable conversation
-        client.post('/api/conversations/save',
-                   json={
-                       'title': 'Python Tutorial',
-                       'messages': [
-                           {'role': 'user', 'content': 'Teach me Python'}
-                       ]
-                   })
+        dashboard_client.post('/api/conversations/save',
+                             json={
+                                 'title': 'Python Tutorial',
+                                 'messages': [
+                                     {'role': 'user', 'content': 'Teach me Python'}
+                                 ]
+                             })
         
-        response = client.get('/api/conversations/search?q=Python')
+        response = dashboard_client.get('/api/conversations/search?q=Python')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'conversations' in data
         assert len(data['conversations']) > 0
 
@@ -5,7 +5,6 @@ Tests the custom combo box behavior in edit mode vs regular mode.
 """
 
 import pytest
-import json
 from src.prompt_manager.web.app import create_app
 
 
@@ -28,7 +27,7 @@ class TestCustomComboDualBehavior:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should have custom properties
         assert data['dropdowns']['Role']['is_custom'] is True
@@ -49,7 +48,7 @@ class TestCustomComboDualBehavior:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should not have custom properties
         assert 'is_custom' not in data['dropdowns']['Role']
@@ -71,7 +70,7 @@ class TestCustomComboDualBehavior:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should have custom properties that indicate placeholder should be shown
         assert data['dropdowns']['Role']['is_custom'] is True
@@ -87,7 +86,7 @@ class TestCustomComboDualBehavior:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should not have custom properties
         assert 'is_custom' not in data['dropdowns']['Role']
@@ -103,7 +102,7 @@ class TestCustomComboDualBehavior:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # First combo box should be enabled
         assert data['dropdowns']['Role']['enabled'] is True
@@ -5,7 +5,6 @@ Tests the server-side edit mode functionality with the template generation endpo
 """
 
 import pytest
-import json
 from src.prompt_manager.web.app import create_app
 
 
@@ -28,7 +27,7 @@ class TestEditModeServerIntegration:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should have dropdowns
         assert 'dropdowns' in data
@@ -55,7 +54,7 @@ class TestEditModeServerIntegration:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should have dropdowns
         assert 'dropdowns' in data
@@ -82,7 +81,7 @@ class TestEditModeServerIntegration:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # First combo box should be enabled
         assert data['dropdowns']['Role']['enabled'] is True
@@ -101,7 +100,7 @@ class TestEditModeServerIntegration:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should preserve original template
         assert data['template'] == self.template
@@ -119,7 +118,7 @@ class TestEditModeServerIntegration:
                                   content_type='application/json')
         
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Should have dropdowns for different variables
         assert 'User' in data['dropdowns']
@@ -7,8 +7,6 @@ including all major features and their interactions.
 
 import pytest
 import json
-import tempfile
-import os
 from unittest.mock import patch
 from src.prompt_manager.prompt_manager import PromptManager
 
@@ -17,16 +15,11 @@ class TestEndToEndWorkflow:
     """Test complete user workflows from start to finish."""
     
     @pytest.fixture
-    def temp_storage(self):
+    def temp_storage(self, tmp_path):
         """Create temporary storage for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump([], f)
-            temp_file = f.name
-        
-        yield temp_file
-        
-        # Cleanup
-        os.unlink(temp_file)
+        storage = tmp_path / "prompts.json"
+        storage.write_text(json.dumps([]))
+        return str(storage)
     
     @pytest.fixture
     def manager(self, temp_storage):
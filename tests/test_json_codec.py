@@ -0,0 +1,30 @@
+# tests/test_json_codec.py
+
+import pytest
+from src.prompt_manager import json_codec
+from src.prompt_manager.json_codec import dumps_json, loads_json
+
+DATA = {'prompts': [{'name': 'Café', 'text': 'Say “hi”'}], 'query': ''}
+
+
+@pytest.fixture
+def without_orjson(monkeypatch):
+    """Force the standard library fallback."""
+    monkeypatch.setattr(json_codec, 'orjson', None)
+
+
+def test_dumps_json_output_does_not_depend_on_orjson(monkeypatch):
+    with_orjson = (dumps_json(DATA), dumps_json(DATA, indent=True))
+
+    monkeypatch.setattr(json_codec, 'orjson', None)
+
+    assert (dumps_json(DATA), dumps_json(DATA, indent=True)) == with_orjson
+    assert 'Café' in with_orjson[0]
+
+
+@pytest.mark.usefixtures("without_orjson")
+def test_loads_json_fallback_reads_str_and_bytes():
+    text = dumps_json(DATA)
+
+    assert loads_json(text) == DATA
+    assert loads_json(text.encode('utf-8')) == DATA
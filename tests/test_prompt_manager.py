@@ -1,27 +1,17 @@
 # tests/test_prompt_manager.py
 
 import pytest
-import tempfile
-import os
 from src.prompt_manager.prompt_manager import PromptManager
 from src.prompt_manager.prompt import Prompt
 
 
 class TestPromptManager:
     @pytest.fixture
-    def temp_manager(self):
+    def temp_manager(self, tmp_path):
         """Create a PromptManager with a temporary storage file."""
-        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
-            tmp_path = tmp.name
-        
-        manager = PromptManager(tmp_path)
-        yield manager
-        
-        # Cleanup
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+        storage = tmp_path / "prompts.json"
+        storage.touch()
+        return PromptManager(str(storage))
     
     def test_add_prompt_returns_guid(self, temp_manager):
         prompt_id = temp_manager.add_prompt("Test Prompt", "Hello world", "test")
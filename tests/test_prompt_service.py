@@ -0,0 +1,180 @@
+# tests/test_prompt_service.py
+
+import json
+
+import pytest
+
+from src.prompt_manager.prompt_manager import PromptManager
+from src.prompt_manager.storage import InMemoryStorage
+from src.prompt_manager.web.services.prompt_service import PromptService
+
+
+class CountingStorage(InMemoryStorage):
+    """InMemoryStorage that counts saves and can be told to fail them."""
+
+    def __init__(self):
+        super().__init__()
+        self.save_calls = 0
+        self.fail_saves = False
+
+    def save_prompts(self, prompts):
+        self.save_calls += 1
+        if self.fail_saves:
+            return False
+        return super().save_prompts(prompts)
+
+
+class TestPromptService:
+    def setup_method(self):
+        self.storage = CountingStorage()
+        self.manager = PromptManager(storage=self.storage)
+        self.id1 = self.manager.add_prompt('Greeting', 'Say hello', 'General')
+        self.id2 = self.manager.add_prompt('Farewell', 'Say goodbye', 'General')
+        self.id3 = self.manager.add_prompt('Python', 'Write Python code', 'Programming')
+        self.storage.save_calls = 0
+        self.service = PromptService(prompt_manager=self.manager)
+
+    def saved_prompts(self):
+        return self.storage.load_prompts()
+
+    def test_update_prompt_saves_immediately(self):
+        success, _ = self.service.update_prompt(self.id1, 'Hi', 'Say hi', 'General')
+
+        assert success
+        assert self.storage.save_calls == 1
+        saved = self.saved_prompts()[self.id1]
+        assert saved.name == 'Hi'
+        assert saved.text == 'Say hi'
+        assert saved.modified_at.tzinfo is None
+
+    def test_update_prompt_not_found(self):
+        success, message = self.service.update_prompt('missing', 'Hi', 'Say hi', 'General')
+
+        assert not success
+        assert message == "Prompt not found"
+        assert self.storage.save_calls == 0
+
+    def test_failed_save_rolls_back_update(self):
+        self.storage.fail_saves = True
+
+        success, message = self.service.update_prompt(self.id1, 'Hi', 'Say hi', 'General')
+
+        assert not success
+        assert message == "Error updating prompt: prompts could not be saved"
+        assert self.service.get_prompt_by_id(self.id1)['name'] == 'Greeting'
+
+        # A later, unrelated write must not persist the failed edit
+        self.storage.fail_saves = False
+        self.service.update_prompt(self.id2, 'Bye', 'Say bye', 'General')
+        assert self.saved_prompts()[self.id1].name == 'Greeting'
+
+    def test_update_prompts_bulk_saves_once(self):
+        success, message = self.service.update_prompts_bulk([
+            {'id': self.id1, 'name': 'Hi', 'text': 'Say hi'},
+            {'id': self.id3, 'name': 'Rust', 'text': 'Write Rust code', 'category': 'Systems'},
+        ])
+
+        assert success
+        assert message == "Successfully updated 2 prompts"
+        assert self.storage.save_calls == 1
+        saved = self.saved_prompts()
+        assert (saved[self.id1].name, saved[self.id1].category) == ('Hi', 'General')
+        assert (saved[self.id3].name, saved[self.id3].category) == ('Rust', 'Systems')
+
+    def test_update_prompts_bulk_changes_nothing_if_one_prompt_is_missing(self):
+        success, message = self.service.update_prompts_bulk([
+            {'id': self.id1, 'name': 'Hi', 'text': 'Say hi'},
+            {'id': 'missing', 'name': 'Gone', 'text': 'Nothing here'},
+        ])
+
+        assert not success
+        assert message == "Prompt not found: missing"
+        assert self.storage.save_calls == 0
+        assert self.service.get_prompt_by_id(self.id1)['name'] == 'Greeting'
+
+    def test_delete_prompt_removes_from_list_and_index(self):
+        success, _ = self.service.delete_prompt(self.id2)
+
+        assert success
+        assert self.storage.save_calls == 1
+        assert list(self.saved_prompts()) == [self.id1, self.id3]
+        assert self.service.get_prompt_by_id(self.id2) is None
+
+    def test_delete_missing_prompt_does_not_save(self):
+        success, message = self.service.delete_prompt('missing')
+
+        assert not success
+        assert message == "Prompt not found"
+        assert self.storage.save_calls == 0
+
+    def test_import_prompts_replaces_prompts_with_one_save(self):
+        success, message = self.service.import_prompts(json.dumps([
+            {'name': 'Imported', 'text': 'From a file', 'category': 'Other'},
+        ]))
+
+        assert success
+        assert message == "Successfully imported 1 prompts"
+        assert self.storage.save_calls == 1
+        assert [p['name'] for p in self.service.get_all_prompts()] == ['Imported']
+
+    def test_short_query_results_are_cached(self):
+        assert [p['id'] for p in self.service.search_prompts('say')] == [self.id1, self.id2]
+
+        self.manager.prompts.clear()
+        assert [p['id'] for p in self.service.search_prompts('SAY')] == [self.id1, self.id2]
+
+    def test_prefix_cache_is_invalidated_by_updates(self):
+        assert [p['id'] for p in self.service.search_prompts('hi')] == []
+
+        self.service.update_prompt(self.id1, 'Hi', 'Say hi', 'General')
+
+        assert [p['id'] for p in self.service.search_prompts('hi')] == [self.id1]
+
+    def test_readonly_prompts_are_a_shared_tuple(self):
+        prompts = self.service.get_all_prompts(readonly=True)
+
+        assert isinstance(prompts, tuple)
+        assert self.service.get_all_prompts(readonly=True) is prompts
+
+    def test_search_prompts_always_returns_a_list(self):
+        for query in ('', 'say', 'python'):
+            assert isinstance(self.service.search_prompts(query), list)
+
+    def test_get_all_prompts_returns_a_list_copy_by_default(self):
+        prompts = self.service.get_all_prompts()
+        prompts.clear()
+
+        assert len(self.service.get_all_prompts()) == 3
+
+    def test_returned_prompts_do_not_share_the_cached_dicts(self):
+        self.service.get_prompt_by_id(self.id1)['name'] = 'Changed'
+        self.service.get_all_prompts()[0]['name'] = 'Changed'
+        self.service.search_prompts('say')[0]['name'] = 'Changed'
+
+        assert self.service.get_prompt_by_id(self.id1)['name'] == 'Greeting'
+        with pytest.raises(TypeError):
+            self.service.get_all_prompts(readonly=True)[0]['name'] = 'Changed'
+
+    def test_reload_picks_up_prompts_saved_elsewhere(self):
+        assert len(self.service.get_all_prompts()) == 3
+
+        PromptManager(storage=self.storage).add_prompt('Other', 'Saved by another manager')
+        assert len(self.service.get_all_prompts()) == 3
+
+        self.service.reload()
+        assert len(self.service.get_all_prompts()) == 4
+
+    def test_readonly_prompts_are_rebuilt_after_delete(self):
+        before = self.service.get_all_prompts(readonly=True)
+
+        self.service.delete_prompt(self.id1)
+
+        after = self.service.get_all_prompts(readonly=True)
+        assert after is not before
+        assert [p['id'] for p in after] == [self.id2, self.id3]
+
+    def test_export_prompts_round_trips(self):
+        exported = self.service.export_prompts()
+
+        assert json.loads(exported) == [p.to_dict() for p in self.manager.list_prompts()]
+        assert exported.startswith('[\n  {')
@@ -3,7 +3,8 @@
 import pytest
 import os
 import json
-from src.prompt_manager.storage import StorageManager
+from src.prompt_manager import json_codec
+from src.prompt_manager.storage import StorageManager, InMemoryStorage
 from src.prompt_manager.prompt import Prompt
 
 
@@ -66,6 +67,21 @@ class TestStorageManager:
         assert len(loaded_prompts) == 1
         assert loaded_prompts["id1"].text == "Hello 世界"
     
+    def test_save_and_load_without_orjson(self, tmp_path, monkeypatch):
+        """Test the standard library fallback writes the same file and reads it back."""
+        prompt = Prompt("Test", "Hello 世界", "test")
+        prompt.id = "id1"
+        with_orjson = tmp_path / "with_orjson.json"
+        StorageManager(str(with_orjson)).save_prompts({"id1": prompt})
+        
+        monkeypatch.setattr(json_codec, 'orjson', None)
+        storage_file = tmp_path / "without_orjson.json"
+        storage = StorageManager(str(storage_file))
+        
+        assert storage.save_prompts({"id1": prompt}) is True
+        assert storage_file.read_bytes() == with_orjson.read_bytes()
+        assert storage.load_prompts()["id1"].text == "Hello 世界"
+    
     def test_delete_file(self, tmp_path):
         """Test deleting storage file."""
         storage_file = tmp_path / "delete_test.json"
@@ -90,4 +106,35 @@ class TestStorageManager:
         storage = StorageManager(str(storage_file))
         
         result = storage.delete_file()
-        assert result is True  # Should succeed even if file doesn't exist 
\ No newline at end of file
+        assert result is True  # Should succeed even if file doesn't exist
+
+
+class TestInMemoryStorage:
+    def test_save_and_load_prompts(self):
+        """Test saving and loading prompts without a file."""
+        storage = InMemoryStorage()
+        assert storage.load_prompts() == {}
+        assert not storage.file_exists()
+        
+        prompt = Prompt("Test 1", "Hello 世界", "test")
+        prompt.id = "id1"
+        assert storage.save_prompts({"id1": prompt}) is True
+        assert storage.file_exists()
+        
+        # Loaded prompts are fresh copies, like a round trip through a file
+        loaded_prompt = storage.load_prompts()["id1"]
+        assert loaded_prompt is not prompt
+        assert loaded_prompt.name == "Test 1"
+        assert loaded_prompt.text == "Hello 世界"
+        assert loaded_prompt.id == "id1"
+    
+    def test_delete_file(self):
+        """Test deleting forgets the saved prompts."""
+        storage = InMemoryStorage()
+        prompt = Prompt("Test", "Hello", "test")
+        prompt.id = "id1"
+        storage.save_prompts({"id1": prompt})
+        
+        assert storage.delete_file() is True
+        assert not storage.file_exists()
+        assert storage.load_prompts() == {}
@@ -30,9 +30,7 @@ class TestTemplateRoutes:
         }
         
         # Act
-        response = template_client.post('/api/template-persistence/save', 
-                             json=template_data,
-                             content_type='application/json')
+        response = template_client.post('/api/template-persistence/save', json=template_data)
         
         # Assert
         assert response.status_code == 200
@@ -52,9 +50,7 @@ class TestTemplateRoutes:
         }
         
         # Act
-        response = template_client.post('/api/template-persistence/save',
-                             json=invalid_template_data,
-                             content_type='application/json')
+        response = template_client.post('/api/template-persistence/save', json=invalid_template_data)
         
         # Assert
         assert response.status_code == 400
@@ -73,9 +69,7 @@ class TestTemplateRoutes:
             "linkage_data": {}
         }
         
-        template_client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        template_client.post('/api/template-persistence/save', json=template_data)
         
         # Act
         response = template_client.get('/api/template-persistence/load/Load Test Template')
@@ -117,8 +111,8 @@ class TestTemplateRoutes:
             "linkage_data": {}
         }
         
-        template_client.post('/api/template-persistence/save', json=template1, content_type='application/json')
-        template_client.post('/api/template-persistence/save', json=template2, content_type='application/json')
+        template_client.post('/api/template-persistence/save', json=template1)
+        template_client.post('/api/template-persistence/save', json=template2)
         
         # Act
         response = template_client.get('/api/template-persistence/list')
@@ -143,9 +137,7 @@ class TestTemplateRoutes:
             "linkage_data": {}
         }
         
-        template_client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        template_client.post('/api/template-persistence/save', json=template_data)
         
         # Act
         response = template_client.delete('/api/template-persistence/delete/Delete Test Template')
@@ -182,9 +174,7 @@ class TestTemplateRoutes:
             "linkage_data": {}
         }
         
-        template_client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        template_client.post('/api/template-persistence/save', json=template_data)
         
         # Act - Check existing template
         response = template_client.get('/api/template-persistence/exists/Exists Test Template')
@@ -37,9 +37,7 @@ class TestTemplateRoutesIsolated:
         }
         
         # Act
-        response = client.post('/api/template-persistence/save', 
-                             json=template_data,
-                             content_type='application/json')
+        response = client.post('/api/template-persistence/save', json=template_data)
         
         # Assert
         assert response.status_code == 200
@@ -59,9 +57,7 @@ class TestTemplateRoutesIsolated:
         }
         
         # Act
-        response = client.post('/api/template-persistence/save',
-                             json=invalid_template_data,
-                             content_type='application/json')
+        response = client.post('/api/template-persistence/save', json=invalid_template_data)
         
         # Assert
         assert response.status_code == 400
@@ -80,9 +76,7 @@ class TestTemplateRoutesIsolated:
             "linkage_data": {}
         }
         
-        client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        client.post('/api/template-persistence/save', json=template_data)
         
         # Act
         response = client.get('/api/template-persistence/load/Load Test Template')
@@ -124,8 +118,8 @@ class TestTemplateRoutesIsolated:
             "linkage_data": {}
         }
         
-        client.post('/api/template-persistence/save', json=template1, content_type='application/json')
-        client.post('/api/template-persistence/save', json=template2, content_type='application/json')
+        client.post('/api/template-persistence/save', json=template1)
+        client.post('/api/template-persistence/save', json=template2)
         
         # Act
         response = client.get('/api/template-persistence/list')
@@ -152,9 +146,7 @@ class TestTemplateRoutesIsolated:
             "linkage_data": {}
         }
         
-        client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        client.post('/api/template-persistence/save', json=template_data)
         
         # Act
         response = client.delete('/api/template-persistence/delete/Delete Test Template')
@@ -191,9 +183,7 @@ class TestTemplateRoutesIsolated:
             "linkage_data": {}
         }
         
-        client.post('/api/template-persistence/save',
-                   json=template_data,
-                   content_type='application/json')
+        client.post('/api/template-persistence/save', json=template_data)
         
         # Act - Check existing template
         response = client.get('/api/template-persistence/exists/Exists Test Template')